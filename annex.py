@@ -0,0 +1,139 @@
+"""Streaming reader for the HDR Statistical Annex GII table (Table 5).
+
+The annex is read row by row with openpyxl's read-only iterator, so the
+workbook is never loaded as a whole. Header blocks are mapped to the
+columns of gender_inequality_index.xlsx (see data_cache.GII_WORKBOOK_DTYPES),
+footnote columns and aggregate rows are dropped, and the result goes
+straight to the Parquet cache:
+
+    python annex.py HDR21-22_Statistical_Annex_GII_Table.xlsx
+"""
+import data_cache
+
+
+SHEET = 'Table 5'
+
+# (judul blok header, sub-header) -> kolom dashboard
+HEADER_COLUMNS = {
+    ('Gender Inequality Index', 'Value'): 'GII Value',
+    ('Gender Inequality Index', 'Rank'): 'GII Rank',
+    ('Maternal mortality ratio', None): 'Maternal mortality ratio',
+    ('Adolescent birth rate', None): 'Adolescent birth rate',
+    ('Share of seats in parliament', None): 'Share of seats in parliament',
+    ('Population with at least some secondary education', 'Female'): 'F_secondary_edu',
+    ('Population with at least some secondary education', 'Male'): 'M_secondary_edu',
+    ('Labour force participation rate', 'Female'): 'F_labour_force',
+    ('Labour force participation rate', 'Male'): 'M_labour_force',
+}
+
+# Baris judul bagian -> kategori Human Development
+SECTIONS = {
+    'VERY HIGH HUMAN DEVELOPMENT': 'Very High',
+    'HIGH HUMAN DEVELOPMENT': 'High',
+    'MEDIUM HUMAN DEVELOPMENT': 'Medium',
+    'LOW HUMAN DEVELOPMENT': 'Low',
+    'OTHER COUNTRIES OR TERRITORIES': 'Other',
+}
+
+# Nilai kosong di annex
+MISSING = {'..', '—', '-', ''}
+
+
+def _text(value):
+    return str(value).strip() if value is not None else None
+
+
+def map_header(header_rows):
+    """Column index -> dashboard column from the stacked header rows.
+
+    Block titles span several cells, so each title is carried to the right
+    until the next one. Only columns with a year in the last header row hold
+    values; the cells between them are footnote markers.
+    """
+    *title_rows, year_row = header_rows
+    width = max(len(row) for row in header_rows)
+    columns = {}
+    block = None
+    for i in range(width):
+        cells = [_text(row[i]) if i < len(row) else None for row in title_rows]
+        for cell in cells:
+            if any(cell == title for title, _ in HEADER_COLUMNS):
+                block = cell
+        year = year_row[i] if i < len(year_row) else None
+        if block is None or not isinstance(year, int):
+            continue
+        for (title, sub), column in HEADER_COLUMNS.items():
+            if title == block and (sub is None or sub in cells) and column not in columns.values():
+                columns[i] = column
+                break
+    missing = set(HEADER_COLUMNS.values()) - set(columns.values())
+    if missing:
+        raise ValueError(f'kolom tidak ditemukan di header annex: {sorted(missing)}')
+    return columns
+
+
+def _number(value):
+    if value is None or (isinstance(value, str) and value.strip() in MISSING):
+        return None
+    return float(value)
+
+
+def read_annex(path, sheet=SHEET):
+    """Country rows of the annex as a frame shaped like gender_inequality_index.xlsx."""
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True)
+        header_rows = []
+        for row in rows:
+            header_rows.append(row)
+            # Baris 'HDI rank' diikuti baris tahun; keduanya menutup header
+            if _text(row[0]) == 'HDI rank':
+                header_rows.append(next(rows))
+                break
+        columns = map_header(header_rows)
+
+        data = {name: [] for name in data_cache.GII_WORKBOOK_DTYPES}
+        section = None
+        last_rank = 0
+        for row in rows:
+            label = _text(row[1]) if len(row) > 1 else None
+            if label in SECTIONS:
+                section = SECTIONS[label]
+                continue
+            if label is None:
+                # Baris kosong setelah blok 'Other' menutup daftar negara
+                if section == 'Other' and data['Country']:
+                    break
+                continue
+            if section is None:
+                continue
+            # Negara tanpa peringkat HDI diberi nomor lanjutan, seperti di workbook
+            rank = row[0] if isinstance(row[0], int) else last_rank + 1
+            last_rank = rank
+            data['HDI rank'].append(rank)
+            data['Country'].append(label)
+            data['Human Development'].append(section)
+            for i, name in columns.items():
+                data[name].append(_number(row[i]))
+    finally:
+        workbook.close()
+    return pd.DataFrame(data)
+
+
+def load_annex_gii(path):
+    """Annex in the dashboard schema, read through the Parquet cache."""
+    return data_cache.cached_frame(path, read_annex, data_cache.GII_WORKBOOK_DTYPES, kind='gii')
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    for source in sys.argv[1:]:
+        # Lewat cache Parquet, sehingga dashboard berikutnya tidak perlu mem-parse ulang
+        start = time.perf_counter()
+        frame = load_annex_gii(source)
+        print(f'{source}: {len(frame)} countries loaded in {time.perf_counter() - start:.3f}s')
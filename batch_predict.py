@@ -0,0 +1,155 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+import forecast
+import model_registry
+from regions import region_of
+
+
+# Fitur model -> kolom indikator di HDR21-22 time series
+FEATURE_SOURCES = {
+    'gii value': 'gii',
+    'maternal mortality ratio': 'mmr',
+    'adolescent birth rate': 'abr',
+    'share of seats in parliament': 'pr_f',
+    'f_secondary_edu': 'se_f',
+    'm_secondary_edu': 'se_m',
+    'f_labour_force': 'lfpr_f',
+    'm_labour_force': 'lfpr_m',
+}
+CHUNK_SIZE = 4096
+# Negara-tahun dengan lebih sedikit fitur terisi tidak dinilai (prediction -1)
+MIN_OBSERVED_FEATURES = 6
+
+_predictions = data_cache.VersionedCache('batch_predictions')
+_forecasts = data_cache.VersionedCache('forecast_predictions')
+
+
+def country_regions(store):
+    countries = store.country_table()
+    return np.array([region_of(c, r) for c, r in zip(countries['country'], countries['region'])])
+
+
+def build_features(store, matrices=None, years=None):
+    """One row per country-year with the 15 model features.
+
+    Indicators come straight from the store as (country, year) matrices, so
+    the frame is assembled with array ops only. Missing indicators stay NaN,
+    which XGBoost routes along each split's default branch. ``n_observed``
+    counts the numeric features present; rows below MIN_OBSERVED_FEATURES
+    are not scored. ``matrices`` and ``years`` replace the store's values,
+    e.g. with a forecast.
+    """
+    countries = store.country_table()
+    years = store.years if years is None else years
+    n_countries, n_years = len(countries), len(years)
+
+    frame = pd.DataFrame({
+        'iso3': np.repeat(countries['iso3'].to_numpy(), n_years),
+        'country': np.repeat(countries['country'].to_numpy(), n_years),
+        'region': np.repeat(country_regions(store), n_years),
+        'year': np.tile(years, n_countries),
+    })
+    observed = np.zeros(n_countries * n_years, dtype='i1')
+    for feature, indicator in FEATURE_SOURCES.items():
+        values = (matrices[indicator] if matrices is not None else store.matrix(indicator)[0]).ravel()
+        frame[feature] = values
+        observed += ~np.isnan(values)
+    for column in model_registry.REGION_FEATURES:
+        frame[column] = frame['region'].to_numpy() == column[len('region_'):]
+    frame['n_observed'] = observed
+    return frame
+
+
+def score(model, features, chunk_size=CHUNK_SIZE):
+    """Predict class codes for ``features`` in vectorized chunks."""
+    X = features[model_registry.FEATURE_COLUMNS]
+    out = np.empty(len(X), dtype='i1')
+    for start in range(0, len(X), chunk_size):
+        stop = start + chunk_size
+        out[start:stop] = model.predict(X.iloc[start:stop])
+    return out
+
+
+def score_observed(model, features):
+    """Class codes for rows with at least MIN_OBSERVED_FEATURES features, -1 elsewhere."""
+    codes = np.full(len(features), -1, dtype='i1')
+    scorable = features['n_observed'].to_numpy() >= MIN_OBSERVED_FEATURES
+    if scorable.any():
+        codes[scorable] = score(model, features[scorable])
+    return codes
+
+
+def _result_path(data_version, model_sha, kind='predictions'):
+    return os.path.join(data_cache.CACHE_DIR, f'batch-{kind}-min{MIN_OBSERVED_FEATURES}-'
+                                              f'{data_version[:16]}-{model_sha[:16]}.parquet')
+
+
+def _label(result, codes):
+    result['prediction'] = codes
+    result['prediction_label'] = pd.Categorical.from_codes(codes, model_registry.PREDICTION_LABELS)
+    return result
+
+
+def save(result, data_version, model_sha, kind='predictions'):
+    with data_cache.atomic_write(_result_path(data_version, model_sha, kind)) as f:
+        result.to_parquet(f, index=False)
+
+
+def load(data_version, model_sha, kind='predictions'):
+    """Saved predictions for (data version, model hash) or None."""
+    path = _result_path(data_version, model_sha, kind)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def batch_predictions(store, model_path=model_registry.MODEL_PATH):
+    """Scored country-year frame, cached per (data version, model hash)."""
+    # Hash artefak cukup untuk key; model baru dimuat bila hasil belum ada
+    key = (store.version, data_cache.source_version(model_path))
+
+    def load_or_score():
+        result = load(*key)
+        if result is None:
+            result = build_features(store)
+            _label(result, score_observed(model_registry.get_model(model_path).model, result))
+            save(result, *key)
+        return result
+
+    return _predictions.get(key, load_or_score)
+
+
+def update_predictions(previous, store, changed, model_path=model_registry.MODEL_PATH):
+    """Predictions for ``store`` re-scoring only rows that are new or in ``changed``.
+
+    ``previous`` is the scored frame of an earlier data version and
+    ``changed`` a set of (iso3, year) pairs whose inputs moved. Returns the
+    frame and the number of rows that were scored.
+    """
+    result = build_features(store)
+    rows = pd.MultiIndex.from_arrays([result['iso3'], result['year']])
+    codes = previous.set_index(['iso3', 'year'])['prediction'].reindex(rows).to_numpy(dtype='float64')
+    stale = np.isnan(codes) | rows.isin(list(changed))
+    if stale.any():
+        model = model_registry.get_model(model_path).model
+        codes[stale] = score_observed(model, result[stale])
+    _label(result, codes.astype('i1'))
+    return result, int(stale.sum())
+
+
+def forecast_predictions(store, model_path=model_registry.MODEL_PATH):
+    """Predicted HD category for the projected years (see forecast.py)."""
+    key = (store.version, data_cache.source_version(model_path))
+
+    def load_or_score():
+        result = load(*key, kind='forecast')
+        if result is None:
+            projection = forecast.open_forecast(store)
+            result = build_features(store, forecast.matrices(projection), projection[0])
+            _label(result, score_observed(model_registry.get_model(model_path).model, result))
+            save(result, *key, kind='forecast')
+        return result
+
+    return _forecasts.get(key, load_or_score)
@@ -0,0 +1,204 @@
+"""Headless benchmark for the dashboard's data, chart and model stages.
+
+    python benchmark.py                       # real dataset only
+    python benchmark.py --units 10000 100000  # plus synthetic sub-national units
+
+Each stage is timed separately (best of ``--repeat`` runs) together with its
+tracemalloc peak. Stages labelled "cold" clear the module's process cache
+before every run, so they time the load from the on-disk cache and not a
+dict lookup. Results are appended to .cache/bench/results.jsonl and
+compared with the previous run of the same stage and scale.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import charts
+import compiled_model
+import correlation
+import cube
+import data_cache
+import model_registry
+import pipeline
+import schema
+import timeseries
+import trends
+
+
+RESULTS_PATH = os.path.join(data_cache.CACHE_DIR, 'bench', 'results.jsonl')
+
+
+def make_units(base, n_units, seed=0):
+    """Scale the GII workbook schema up to ``n_units`` synthetic sub-national units.
+
+    Every unit copies a random country row, so country, region, HD group and
+    ranks stay realistic, and each indicator is jittered by ~10%. The unit
+    name goes into an extra ``Unit`` column.
+    """
+    rng = np.random.default_rng(seed)
+    units = base.iloc[rng.integers(0, len(base), n_units)].reset_index(drop=True)
+    units['Unit'] = units['Country'].astype(str) + ' #' + pd.Series(np.arange(n_units)).astype(str)
+    for column, dtype in schema.GII_SCHEMA.items():
+        if dtype == 'float32':
+            noise = rng.normal(1.0, 0.1, n_units).astype('float32')
+            units[column] = units[column] * noise
+    return units
+
+
+def model_features(df_clean):
+    """15-column model input for every row of a cleaned frame."""
+    features = df_clean[model_registry.NUMERIC_FEATURES].astype('float64')
+    for column in model_registry.REGION_FEATURES:
+        features[column] = (df_clean['region'] == column[len('region_'):]).to_numpy()
+    return features
+
+
+def measure(func, repeat, setup=None):
+    """Best wall time over ``repeat`` runs and the tracemalloc peak of one run.
+
+    ``setup`` runs untimed before every run, e.g. to clear a process cache.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def run_stages(raw, repeat, store=None, model=None):
+    """Time every dashboard stage on ``raw`` (a workbook-shaped frame)."""
+    results = []
+    ctx = {}
+
+    def stage(name, func):
+        ctx[name], seconds, peak = measure(func, repeat)
+        results.append({'stage': name, 'seconds': seconds, 'peak_bytes': peak})
+
+    stage('schema', lambda: schema.apply(raw))
+    stage('normalize', lambda: pipeline.normalize(ctx['schema']))
+    stage('quality_report', lambda: pipeline.quality_report(ctx['normalize']))
+    stage('clean', lambda: pipeline.add_region(pipeline.clean(ctx['normalize'])))
+    # Dashboard tidak lagi menjalankan groupby ini (ia mengambil irisan cube, lihat
+    # stage 'cube slice' di bawah); tetap diukur sebagai pembanding
+    stage('groupby_hd (dv1)', lambda: pipeline.hd_counts(ctx['clean']))
+    stage('groupby_region (dv2)', lambda: pipeline.gii_by_region(ctx['clean']))
+    stage('corr', lambda: ctx['clean'].select_dtypes('number').corr())
+
+    stage('figure hd_bar', lambda: charts.hd_bar(ctx['groupby_hd (dv1)']))
+    stage('figure region_pie', lambda: charts.region_pie(ctx['groupby_region (dv2)']))
+    stage('figure correlation_scatter',
+          lambda: charts.correlation_scatter(ctx['clean'], 'gii value', 'maternal mortality ratio'))
+
+    if store is not None:
+        stage('corr yearly (time series)', lambda: correlation.yearly_correlations(store))
+        stage('aggregate cube (time series)', lambda: cube.build(store))
+        stage('cube slice hd_counts', lambda: pipeline.cube_hd_counts(ctx['aggregate cube (time series)'], 2021))
+        stage('cube slice by_region', lambda: pipeline.cube_by_region(ctx['aggregate cube (time series)'], 2021))
+        stage('figure trend_lines (50 countries)',
+              lambda: charts.trend_lines(trends.country_traces(
+                  store, 'Labor Force Participation',
+                  store.country_table()['country'][:50].tolist()), 'Labor Force Participation'))
+        stage('figure gii_map', lambda: charts.gii_map(store))
+        stage('figure gii_map year swap', lambda: charts.with_year(*ctx['figure gii_map'], 2000))
+        stage('figure correlation_heatmap',
+              lambda: charts.correlation_heatmap(ctx['corr yearly (time series)'][1],
+                                                 ctx['corr yearly (time series)'][2][-1]))
+
+    if model is not None:
+        features = model_features(ctx['clean'])
+        stage('predict single row', lambda: model.predict(features.iloc[:1]))
+        stage('predict all rows', lambda: model.predict(features))
+        compiled, seconds, peak = measure(compiled_model.open_compiled, repeat, compiled_model._models.clear)
+        results.append({'stage': 'load compiled model (cold)', 'seconds': seconds, 'peak_bytes': peak})
+        X = compiled.features(features)
+        stage('predict single row (compiled)', lambda: compiled.predict(X[:1]))
+        stage('predict all rows (compiled)', lambda: compiled.predict(X))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_results():
+    previous = {}
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH) as f:
+            for line in f:
+                record = json.loads(line)
+                previous[(record['units'], record['stage'])] = record
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--units', type=int, nargs='*', default=[],
+                        help='synthetic unit counts to benchmark in addition to the real data')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-model', action='store_true', help='skip model.predict stages')
+    args = parser.parse_args()
+
+    # load_data: parse Excel dingin vs baca salinan Parquet
+    load_results = []
+    _, seconds, peak = measure(lambda: pd.read_excel(data_cache.DATA_PATH), args.repeat)
+    load_results.append({'stage': 'load_data (read_excel)', 'seconds': seconds, 'peak_bytes': peak})
+    raw, seconds, peak = measure(lambda: data_cache.load_gii_workbook(data_cache.DATA_PATH), args.repeat)
+    load_results.append({'stage': 'load_data (parquet cache)', 'seconds': seconds, 'peak_bytes': peak})
+    store, seconds, peak = measure(lambda: timeseries.open_store(data_cache.TIME_SERIES_PATH), args.repeat,
+                                   timeseries._stores.clear)
+    load_results.append({'stage': 'open time-series store (cold)', 'seconds': seconds, 'peak_bytes': peak})
+
+    model = None
+    if not args.no_model and os.path.exists(model_registry.MODEL_PATH):
+        model = model_registry.get_model().model
+
+    runs = [(len(raw), load_results + run_stages(raw, args.repeat, store, model))]
+    for n_units in args.units:
+        runs.append((n_units, run_stages(make_units(raw, n_units), args.repeat, model=model)))
+
+    previous = previous_results()
+    commit = git_commit()
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'a') as f:
+        for units, results in runs:
+            print(f'\n== {units} units ==')
+            print(f"{'stage':36} {'ms':>10} {'peak MB':>9} {'vs last':>9}")
+            for result in results:
+                record = dict(result, units=units, commit=commit, timestamp=timestamp)
+                f.write(json.dumps(record) + '\n')
+                last = previous.get((units, result['stage']))
+                change = ''
+                if last and last['seconds'] > 0:
+                    change = f"{100 * (result['seconds'] / last['seconds'] - 1):+.0f}%"
+                print(f"{result['stage']:36} {1000 * result['seconds']:10.2f} "
+                      f"{result['peak_bytes'] / 2 ** 20:9.2f} {change:>9}")
+
+    # ru_maxrss dalam KB di Linux
+    print(f'\npeak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB')
+    if model is None:
+        print('model.predict stages skipped (no model at GII_MODEL_PATH or --no-model)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,29 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import io
+import os
 import warnings
-import plotly.graph_objects as go
-import joblib
+
+import annex
+import data_cache
+import dataset
+import model_registry
+import neighbours
+import timeseries
+import trends
+import batch_predict
+import charts
+import pipeline
+import prerender
+import compiled_model
+import correlation
+import forecast
+import cube
+import gii
+import sensitivity
+import perf
 
 
 # Set page config
@@ -15,12 +34,18 @@ st.set_page_config(
 )
 
 
-# Set color palette
-color_palette = ['#005A8D', '#FF6363', '#FFBD69', '#7BC950', '#843FA1']
-
 # Initialize Streamlit
 warnings.filterwarnings('ignore')
 
+# Instrumentasi: ?debug=1 menampilkan panel timing, ?profile=1 menyimpan cProfile satu rerun
+query_params = st.experimental_get_query_params()
+debug_mode = os.environ.get('GII_DEBUG') == '1' or query_params.get('debug') == ['1']
+profile_rerun = os.environ.get('GII_PROFILE') == '1' or query_params.get('profile') == ['1']
+# ?static=1: chart yang hanya bergantung pada data diambil dari hasil prerender.py
+static_mode = os.environ.get('GII_STATIC') == '1' or query_params.get('static') == ['1']
+perf.start_rerun(profile=profile_rerun)
+perf.mark('setup')
+
 # Custom CSS styles
 st.markdown(
     """
@@ -45,18 +70,34 @@ st.markdown(
 )
 
 # Load the dataset
-file_path = '/Users/keiziapurba/gender_inequality_index.xlsx'
+perf.mark('load_data')
+# Lokasi file sumber diatur di data_cache.py (GII_DATA_PATH, GII_TIME_SERIES_PATH, GII_ANNEX_PATH)
+time_series_path = data_cache.TIME_SERIES_PATH
+
 
+# Satu dataset read-only per proses (Arrow, lihat dataset.py) dipakai bersama
+# semua sesi; script hanya membaca view-nya dan tidak pernah menulis ke frame
+# GII_SOURCE=annex membaca tabel GII langsung dari Statistical Annex UNDP (lihat annex.py)
+if os.environ.get('GII_SOURCE') == 'annex':
+    data = dataset.open_dataset(data_cache.ANNEX_PATH, annex.load_annex_gii)
+else:
+    data = dataset.open_dataset(data_cache.DATA_PATH)
+df, memory = data.view('loaded'), data.memory
 
-@st.cache_data
-def load_data():
-    df = pd.read_excel(file_path)
-    return df
+# Tanpa artefak untuk versi data ini, semua chart dibangun seperti biasa
+static = prerender.open_artifacts(data_cache.source_version(time_series_path)) if static_mode else None
 
-df = load_data()
+
+def show_static(name):
+    """Embed the pre-rendered chart ``name``; False if it has no artifact, so the caller renders it live."""
+    if static is None or name not in static:
+        return False
+    components.html(static.html(name), height=static.height(name))
+    return True
 
 
 # Set sidebar
+perf.mark('sidebar')
 st.sidebar.title('Gender Inequality Index 2021')
 st.sidebar.markdown('Explore dataset Gender Inequality Index')
 
@@ -76,31 +117,30 @@ st.sidebar.dataframe(df)
 # Data Understanding
 st.sidebar.subheader('Data Understanding')
 st.sidebar.write("Jumlah baris dan kolom dalam dataset:", df.shape[0], 'baris', df.shape[1], 'kolom')
+st.sidebar.write("Memori dataset:", round(memory['before_bytes'] / 1024, 1), 'KB →',
+                 round(memory['after_bytes'] / 1024, 1), f"KB (hemat {memory['saved_pct']:.0f}%)")
 st.sidebar.write("Info dataset:")
-st.sidebar.code(df.info())
+# df.info() mencetak ke stdout dan mengembalikan None, jadi tangkap ke buffer
+info_buffer = io.StringIO()
+df.info(buf=info_buffer)
+st.sidebar.code(info_buffer.getvalue())
 
 # Data Cleaning
+perf.mark('cleaning')
 st.sidebar.subheader('Data Cleaning')
 # Ubah kolom menjadi huruf kecil
-df = df.rename(columns=str.lower)
-# Check apakah ada data duplikat
-duplicated = df.duplicated().any()
-st.sidebar.write("Apakah ada data duplikat?:", duplicated)
-# Identifikasi kolom dengan nilai NaN
-kolom_nan = df.columns[df.isnull().any()]
-st.sidebar.write("Kolom dengan nilai NaN:", kolom_nan)
-# Evaluasi tingkat missing values dalam setiap kolom
-missing_values = df.isnull().sum()
+df = data.view('normalized')
+quality = data.quality_report()
+st.sidebar.write("Apakah ada data duplikat?:", quality['duplicated'])
+st.sidebar.write("Kolom dengan nilai NaN:", quality['kolom_nan'])
 st.sidebar.write("Jumlah missing values dalam setiap kolom:")
-st.sidebar.code(missing_values)
-
-# Data Cleaning - Remove NaN values
-df_clean = df.dropna()
+st.sidebar.code(quality['missing_values'])
 
-# Data Cleaning - Data Types
-df_clean[['gii rank', 'maternal mortality ratio']] = df_clean[['gii rank', 'maternal mortality ratio']].astype(int)
+# Data Cleaning - Remove NaN values dan Data Types, lalu tambah region
+df_clean = data.view('clean')
 
 # Main content
+perf.mark('intro')
 st.title('Gender Gap: Are We Stuck in the Past?')
 
 '\n'
@@ -121,227 +161,31 @@ st.write('Human Development merujuk pada proses meningkatkan kesejahteraan dan k
 '\n'
 
 # Human Development
+perf.mark('hd_bar')
 st.subheader('Human Development')
-dv1 = df_clean.groupby(['human development'])['hdi rank'].count().to_frame().rename(columns={'hdi rank': 'count'}).reset_index()
-fig = px.bar(dv1, x='human development', y='count', color='human development',
-             color_discrete_sequence=color_palette)
-fig.update_layout(
-    xaxis=dict(title='Human Development'),
-    yaxis=dict(title='Count'),
-    showlegend=False
-)
-st.plotly_chart(fig, use_container_width=True)
 
-country_to_region = {
-    'Switzerland': 'Europe and Central Asia',
-    'Norway': 'Europe and Central Asia',
-    'Iceland': 'Europe and Central Asia',
-    'Hong Kong, China (SAR)': 'East Asia and the Pacific',
-    'Australia': 'East Asia and the Pacific',
-    'Denmark': 'Europe and Central Asia',
-    'Sweden': 'Europe and Central Asia',
-    'Ireland': 'Europe and Central Asia',
-    'Germany': 'Europe and Central Asia',
-    'Netherlands': 'Europe and Central Asia',
-    'Finland': 'Europe and Central Asia',
-    'Singapore': 'East Asia and the Pacific',
-    'Belgium': 'Europe and Central Asia',
-    'New Zealand': 'East Asia and the Pacific',
-    'Canada': 'North America',
-    'Liechtenstein': 'Europe and Central Asia',
-    'Luxembourg': 'Europe and Central Asia',
-    'United Kingdom': 'Europe and Central Asia',
-    'Japan': 'East Asia and the Pacific',
-    'Korea (Republic of)': 'East Asia and the Pacific',
-    'United States': 'North America',
-    'Israel': 'Middle East and North Africa',
-    'Malta': 'Europe and Central Asia',
-    'Slovenia': 'Europe and Central Asia',
-    'Austria': 'Europe and Central Asia',
-    'United Arab Emirates': 'Middle East and North Africa',
-    'Spain': 'Europe and Central Asia',
-    'France': 'Europe and Central Asia',
-    'Cyprus': 'Europe and Central Asia',
-    'Italy': 'Europe and Central Asia',
-    'Estonia': 'Europe and Central Asia',
-    'Czechia': 'Europe and Central Asia',
-    'Greece': 'Europe and Central Asia',
-    'Poland': 'Europe and Central Asia',
-    'Bahrain': 'Middle East and North Africa',
-    'Lithuania': 'Europe and Central Asia',
-    'Saudi Arabia': 'Middle East and North Africa',
-    'Portugal': 'Europe and Central Asia',
-    'Latvia': 'Europe and Central Asia',
-    'Andorra': 'Europe and Central Asia',
-    'Croatia': 'Europe and Central Asia',
-    'Chile': 'Latin America and the Caribbean',
-    'Qatar': 'Middle East and North Africa',
-    'San Marino': 'Europe and Central Asia',
-    'Slovakia': 'Europe and Central Asia',
-    'Hungary': 'Europe and Central Asia',
-    'Argentina': 'Latin America and the Caribbean',
-    'Türkiye': 'Europe and Central Asia',
-    'Montenegro': 'Europe and Central Asia',
-    'Kuwait': 'Middle East and North Africa',
-    'Brunei Darussalam': 'East Asia and the Pacific',
-    'Russian Federation': 'Europe and Central Asia',
-    'Romania': 'Europe and Central Asia',
-    'Oman': 'Middle East and North Africa',
-    'Bahamas': 'Latin America and the Caribbean',
-    'Kazakhstan': 'Europe and Central Asia',
-    'Trinidad and Tobago': 'Latin America and the Caribbean',
-    'Costa Rica': 'Latin America and the Caribbean',
-    'Uruguay': 'Latin America and the Caribbean',
-    'Belarus': 'Europe and Central Asia',
-    'Panama': 'Latin America and the Caribbean',
-    'Malaysia': 'East Asia and the Pacific',
-    'Georgia': 'Europe and Central Asia',
-    'Mauritius': 'Sub-Saharan Africa',
-    'Serbia': 'Europe and Central Asia',
-    'Thailand': 'East Asia and the Pacific',
-    'Albania': 'Europe and Central Asia',
-    'Bulgaria': 'Europe and Central Asia',
-    'Grenada': 'Latin America and the Caribbean',
-    'Barbados': 'Latin America and the Caribbean',
-    'Antigua and Barbuda': 'Latin America and the Caribbean',
-    'Seychelles': 'Sub-Saharan Africa',
-    'Sri Lanka': 'South Asia',
-    'Bosnia and Herzegovina': 'Europe and Central Asia',
-    'Saint Kitts and Nevis': 'Latin America and the Caribbean',
-    'Iran (Islamic Republic of)': 'Middle East and North Africa',
-    'Ukraine': 'Europe and Central Asia',
-    'North Macedonia': 'Europe and Central Asia',
-    'China': 'East Asia and the Pacific',
-    'Dominican Republic': 'Latin America and the Caribbean',
-    'Moldova (Republic of)': 'Europe and Central Asia',
-    'Palau': 'East Asia and the Pacific',
-    'Cuba': 'Latin America and the Caribbean',
-    'Peru': 'Latin America and the Caribbean',
-    'Armenia': 'Europe and Central Asia',
-    'Mexico': 'Latin America and the Caribbean',
-    'Brazil': 'Latin America and the Caribbean',
-    'Colombia': 'Latin America and the Caribbean',
-    'Saint Vincent and the Grenadines': 'Latin America and the Caribbean',
-    'Maldives': 'South Asia',
-    'Algeria': 'Middle East and North Africa',
-    'Azerbaijan': 'Europe and Central Asia',
-    'Tonga': 'East Asia and the Pacific',
-    'Turkmenistan': 'Europe and Central Asia',
-    'Ecuador': 'Latin America and the Caribbean',
-    'Mongolia': 'East Asia and the Pacific',
-    'Egypt': 'Middle East and North Africa',
-    'Tunisia': 'Middle East and North Africa',
-    'Fiji': 'East Asia and the Pacific',
-    'Suriname': 'Latin America and the Caribbean',
-    'Uzbekistan': 'Europe and Central Asia',
-    'Dominica': 'Latin America and the Caribbean',
-    'Jordan': 'Middle East and North Africa',
-    'Libya': 'Middle East and North Africa',
-    'Paraguay': 'Latin America and the Caribbean',
-    'Palestine, State of': 'Middle East and North Africa',
-    'Saint Lucia': 'Latin America and the Caribbean',
-    'Guyana': 'Latin America and the Caribbean',
-    'South Africa': 'Sub-Saharan Africa',
-    'Jamaica': 'Latin America and the Caribbean',
-    'Samoa': 'East Asia and the Pacific',
-    'Gabon': 'Sub-Saharan Africa',
-    'Lebanon': 'Middle East and North Africa',
-    'Indonesia': 'East Asia and the Pacific',
-    'Viet Nam': 'East Asia and the Pacific',
-    'Philippines': 'East Asia and the Pacific',
-    'Botswana': 'Sub-Saharan Africa',
-    'Bolivia (Plurinational State of)': 'Latin America and the Caribbean',
-    'Kyrgyzstan': 'Europe and Central Asia',
-    'Venezuela (Bolivarian Republic of)': 'Latin America and the Caribbean',
-    'Iraq': 'Middle East and North Africa',
-    'Tajikistan': 'Europe and Central Asia',
-    'Belize': 'Latin America and the Caribbean',
-    'Morocco': 'Middle East and North Africa',
-    'El Salvador': 'Latin America and the Caribbean',
-    'Nicaragua': 'Latin America and the Caribbean',
-    'Bhutan': 'South Asia',
-    'Cabo Verde': 'Sub-Saharan Africa',
-    'Bangladesh': 'South Asia',
-    'Tuvalu': 'East Asia and the Pacific',
-    'Marshall Islands': 'East Asia and the Pacific',
-    'India': 'South Asia',
-    'Ghana': 'Sub-Saharan Africa',
-    'Micronesia (Federated States of)': 'East Asia and the Pacific',
-    'Guatemala': 'Latin America and the Caribbean',
-    'Kiribati': 'East Asia and the Pacific',
-    'Honduras': 'Latin America and the Caribbean',
-    'Sao Tome and Principe': 'Sub-Saharan Africa',
-    'Namibia': 'Sub-Saharan Africa',
-    "Lao People's Democratic Republic": 'East Asia and the Pacific',
-    'Timor-Leste': 'East Asia and the Pacific',
-    'Vanuatu': 'East Asia and the Pacific',
-    'Nepal': 'South Asia',
-    'Eswatini (Kingdom of)': 'Sub-Saharan Africa',
-    'Equatorial Guinea': 'Sub-Saharan Africa',
-    'Cambodia': 'East Asia and the Pacific',
-    'Zimbabwe': 'Sub-Saharan Africa',
-    'Angola': 'Sub-Saharan Africa',
-    'Myanmar': 'East Asia and the Pacific',
-    'Syrian Arab Republic': 'Middle East and North Africa',
-    'Cameroon': 'Sub-Saharan Africa',
-    'Kenya': 'Sub-Saharan Africa',
-    'Congo': 'Sub-Saharan Africa',
-    'Zambia': 'Sub-Saharan Africa',
-    'Solomon Islands': 'East Asia and the Pacific',
-    'Comoros': 'Sub-Saharan Africa',
-    'Papua New Guinea': 'East Asia and the Pacific',
-    'Mauritania': 'Sub-Saharan Africa',
-    "Côte d'Ivoire": 'Sub-Saharan Africa',
-    'Tanzania (United Republic of)': 'Sub-Saharan Africa',
-    'Pakistan': 'South Asia',
-    'Togo': 'Sub-Saharan Africa',
-    'Haiti': 'Latin America and the Caribbean',
-    'Nigeria': 'Sub-Saharan Africa',
-    'Rwanda': 'Sub-Saharan Africa',
-    'Benin': 'Sub-Saharan Africa',
-    'Uganda': 'Sub-Saharan Africa',
-    'Lesotho': 'Sub-Saharan Africa',
-    'Malawi': 'Sub-Saharan Africa',
-    'Senegal': 'Sub-Saharan Africa',
-    'Djibouti': 'Middle East and North Africa',
-    'Sudan': 'Sub-Saharan Africa',
-    'Madagascar': 'Sub-Saharan Africa',
-    'Gambia': 'Sub-Saharan Africa',
-    'Ethiopia': 'Sub-Saharan Africa',
-    'Eritrea': 'Sub-Saharan Africa',
-    'Guinea-Bissau': 'Sub-Saharan Africa',
-    'Liberia': 'Sub-Saharan Africa',
-    'Congo (Democratic Republic of the)': 'Sub-Saharan Africa',
-    'Afghanistan': 'South Asia',
-    'Sierra Leone': 'Sub-Saharan Africa',
-    'Guinea': 'Sub-Saharan Africa',
-    'Yemen': 'Middle East and North Africa',
-    'Burkina Faso': 'Sub-Saharan Africa',
-    'Mozambique': 'Sub-Saharan Africa',
-    'Mali': 'Sub-Saharan Africa',
-    'Burundi': 'Sub-Saharan Africa',
-    'Central African Republic': 'Sub-Saharan Africa',
-    'Niger': 'Sub-Saharan Africa',
-    'Chad': 'Sub-Saharan Africa',
-    'South Sudan': 'Sub-Saharan Africa',
-    'Somalia': 'Sub-Saharan Africa',
-    'Timor-Leste': 'East Asia and the Pacific',
-    'Unknown': 'Unknown'
-}
 
-df_clean['region'] = df_clean['country'].map(country_to_region)
+# Agregat region x HD group x tahun x indikator dihitung sekali per versi data
+# dan dipakai bersama semua sesi (lihat cube.py); chart di bawah hanya mengambil satu irisan
+if not show_static('hd_bar'):
+    aggregates = cube.open_cube(timeseries.open_store(time_series_path))
+    cube_years = aggregates.years
+    hd_year = st.slider('Year:', int(cube_years[0]), int(cube_years[-1]), int(cube_years[-1]), key='hd_year')
+    fig = charts.hd_bar(pipeline.cube_hd_counts(aggregates, hd_year))
+    st.plotly_chart(fig, use_container_width=True)
 
 
 # Gender Inequality Index by Region
+perf.mark('region_pie')
 st.subheader('Gender Inequality Index by Region')
-dv2 = df_clean.groupby(['region'])['gii value'].mean().to_frame().reset_index()
-dv2['color'] = ['blue' if r == 'Sub-Saharan Africa' else 'gray' for r in dv2['region']]
-fig = px.pie(dv2, values='gii value', names='region', hole=0.4,
-             color='color', color_discrete_map={'blue': 'blue', 'gray': 'lightgray'},
-             labels={'region': 'Region', 'gii value': 'GII Value'})
-fig.update_traces(textposition='inside', textinfo='percent+label')
-fig.update_layout(showlegend=False)
-st.plotly_chart(fig, use_container_width=True)
+region_indicator = st.selectbox('Indikator:', list(cube.REGION_INDICATORS), key='region_indicator')
+if not show_static(f'region_pie-{cube.REGION_INDICATORS[region_indicator]}'):
+    aggregates = cube.open_cube(timeseries.open_store(time_series_path))
+    cube_years = aggregates.years
+    region_year = st.slider('Year:', int(cube_years[0]), int(cube_years[-1]), int(cube_years[-1]), key='region_year')
+    dv2 = pipeline.cube_by_region(aggregates, region_year, cube.REGION_INDICATORS[region_indicator], region_indicator)
+    fig = charts.region_pie(dv2, region_indicator, region_indicator)
+    st.plotly_chart(fig, use_container_width=True)
 
 
 
@@ -350,16 +194,11 @@ st.plotly_chart(fig, use_container_width=True)
 st.set_option('deprecation.showPyplotGlobalUse', False)
 
 # Melihat Korelasi
+perf.mark('correlation_scatter')
 st.subheader('Melihat Korelasi')
 x_label = st.selectbox('Select x-axis:', df_clean.columns[2:])
 y_label = st.selectbox('Select y-axis:', df_clean.columns[2:])
-scatter_plot = px.scatter(df_clean, x=x_label, y=y_label, color='region',
-                          color_discrete_sequence=px.colors.qualitative.Pastel1)
-scatter_plot.update_layout(
-    xaxis=dict(title=x_label),
-    yaxis=dict(title=y_label),
-    showlegend=True
-)
+scatter_plot = charts.correlation_scatter(df_clean, x_label, y_label)
 st.set_option('deprecation.showPyplotGlobalUse', False)
 st.plotly_chart(scatter_plot, use_container_width=True)
 
@@ -371,30 +210,51 @@ st.write('Melalui visualisasi scatter plot diatas, dapat diketahui korelasi anta
 
 
 # Visualisasi Gender Inequality Index by Country
+perf.mark('choropleth')
 st.subheader('Gender Inequality Index by Country')
-fig = px.choropleth(df_clean, locations='country', locationmode='country names', color='gii value',
-                    hover_data=['gii value', 'region'], 
-                    color_continuous_scale='Viridis')
 
-fig.update_layout(
-    
-    geo=dict(showframe=False, showcoastlines=False, projection_type='equirectangular')
-)
 
-st.plotly_chart(fig)
+# Peta di-key dengan ISO3 dan disimpan sebagai JSON per versi data, satu objek
+# untuk semua sesi; slider tahun hanya mengganti array warna
+@perf.shared
+def load_gii_map(data_version):
+    store = timeseries.open_store(time_series_path)
+    return charts.gii_map(store)
+
+
+if not show_static('gii_map'):
+    gii_map_json, gii_map_years, gii_map_colors = load_gii_map(data_cache.source_version(time_series_path))
+    map_year = st.slider('Year:', int(gii_map_years[0]), int(gii_map_years[-1]), int(gii_map_years[-1]),
+                         key='map_year')
+    st.plotly_chart(charts.with_year(gii_map_json, gii_map_years, gii_map_colors, map_year))
 
 st.write('Wilayah Amerika Utara dan Eropa, serta Asia Tengah, didominasi oleh negara-negara dengan tingkat pembangunan manusia yang sangat tinggi. Hal ini disebabkan oleh rendahnya nilai GII, yang menunjukkan kesenjangan gender yang lebih kecil. Di sisi lain, Afrika Sub-Sahara memiliki tingkat human development yang rendah karena nilai GII yang tinggi.')
 
 '\n'
 
 # Visualisasi Trend of Female and Male Labor Force Participation
+perf.mark('labour_force_chart')
 st.subheader('Trend of Female and Male Labor Force Participation')
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=df_clean['country'], y=df_clean['f_labour_force'], mode='lines', name='Female Labor Force'))
-fig.add_trace(go.Scatter(x=df_clean['country'], y=df_clean['m_labour_force'], mode='lines', name='Male Labor Force'))
-fig.update_layout(
-                  xaxis_title='Country', yaxis_title='Labor Force Participation')
-st.plotly_chart(fig)
+
+# Tren per negara 1990-2021 dari time series; trace di-cache per negara dan
+# di-downsample (LTTB) bila banyak negara dipilih, lihat trends.py.
+# Mode static menampilkan negara default saja.
+trend_names = {pair: f'trend-{female[:-2]}' for pair, (female, _) in trends.PAIRS.items()}
+
+
+def show_trend(pair):
+    if not show_static(trend_names[pair]):
+        fig = charts.trend_lines(trends.country_traces(trend_store, pair, trend_countries), pair)
+        st.plotly_chart(fig)
+
+
+trend_store = timeseries.open_store(time_series_path)
+trend_countries = trends.DEFAULT_COUNTRIES
+# Pilihan negara hanya berguna bila ada chart tren yang dibangun live
+if static is None or not all(name in static for name in trend_names.values()):
+    trend_countries = st.multiselect('Negara:', trend_store.country_table()['country'].tolist(),
+                                     default=trends.DEFAULT_COUNTRIES, key='trend_countries')
+show_trend('Labor Force Participation')
 
 # Keterangan Visualisasi Trend of Female and Male Labor Force Participation
 st.write("Berdasarkan grafik di atas, dapat dilihat bahwa proporsi penduduk usia kerja (usia 15 tahun ke atas) yang terlibat dalam pasar tenaga kerja, baik dengan bekerja atau mencari pekerjaan pada tahun 2021 di dominasi jumlahnya oleh laki-laki. Secara garis besar, dapat dilihat bahwa ada ketimpangan dalam jumlah persentase partisipasi angkatan kerja. Nilai persentase paling rendah dimiliki oleh female labour negara Yemen sebesar 5.9. Sedangkan persentase tertinggi dimiliki oleh male labour negara Qatar sebesar 95.4.")
@@ -403,13 +263,9 @@ st.write("Berdasarkan grafik di atas, dapat dilihat bahwa proporsi penduduk usia
 '\n'
 
 # Visualisasi Trend of Female and Male Secondary Education Participation
+perf.mark('secondary_education_chart')
 st.subheader('Trend of Female and Male Secondary Education Participation')
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=df_clean['country'], y=df_clean['f_secondary_edu'], mode='lines', name='Female Secondary Education'))
-fig.add_trace(go.Scatter(x=df_clean['country'], y=df_clean['m_secondary_edu'], mode='lines', name='Male Secondary Education'))
-fig.update_layout(title='Trend of Female and Male Secondary Education Participation',
-                  xaxis_title='Country', yaxis_title='Secondary Education Participation')
-st.plotly_chart(fig)
+show_trend('Secondary Education Participation')
 
 # Keterangan Visualisasi Trend of Female and Male Secondary Education Participation
 st.write("Berdasarkan grafik di atas, dapat dilihat bahwa secara garis besar di semua negara, perempuan yang memiliki pendidikan menengah (secondary education) jumlahnya lebih sedikit hingga menyamai jumlah laki-laki yang memiliki pendidikan tersebut. Secondary education disini merujuk pada tingkat pendidikan yang berada di antara pendidikan dasar (misalnya, SD atau MI) dan pendidikan tinggi (seperti perguruan tinggi atau universitas). Biasanya, pendidikan menengah mencakup jenjang pendidikan seperti SMP atau MTs, SMA atau MA, dan sejenisnya")
@@ -417,44 +273,27 @@ st.write("Berdasarkan grafik di atas, dapat dilihat bahwa secara garis besar di
 '\n'
 '\n'
 
+# Visualisasi Trend of Female and Male Share of Seats in Parliament
+perf.mark('parliament_chart')
+st.subheader('Trend of Female and Male Share of Seats in Parliament')
+show_trend('Share of Seats in Parliament')
+
+'\n'
+'\n'
+
 # Correlation Heatmap
+perf.mark('heatmap')
 st.subheader('Correlation Heatmap')
-# Human development
-mapping_hd = {
-    'Low': 0,
-    'Medium': 1,
-    'High': 2,
-    'Very High': 3
-}
-df_clean['human development'] = df_clean['human development'].map(mapping_hd)
-
-columns_to_exclude = ['hdi rank', 'country', 'gii rank', 'region']  # Kolom yang ingin dikecualikan
-
-
-# Menghapus kolom yang tidak diinginkan dari DataFrame
-corr_matrix = df_clean.drop(columns=columns_to_exclude).corr()
-
-fig = go.Figure(data=go.Heatmap(
-    z=corr_matrix.values,
-    x=list(corr_matrix.columns),
-    y=list(corr_matrix.index),
-    text=corr_matrix.round(2).values,  # Menambahkan nilai angka ke dalam kotak
-    colorscale='RdBu',
-    zmin=-1,
-    zmax=1,
-    colorbar=dict(title='Correlation')
-))
-
-fig.update_layout(
-    xaxis_tickangle=-55,
-    yaxis_tickangle=0,
-    width=700,
-    height=700,
-    title='Correlation Heatmap'
-)
 
-fig.update_traces(hovertemplate='Correlation: %{text}')  # Menampilkan angka saat dihover
-st.plotly_chart(fig)
+
+# Korelasi semua tahun dihitung sekali (year, feature, feature); slider hanya lookup
+if not show_static('correlation_heatmap'):
+    corr_years, corr_features, corr_by_year = correlation.open_correlations(timeseries.open_store(time_series_path))
+    corr_year = st.slider('Year:', int(corr_years[0]), int(corr_years[-1]), int(corr_years[-1]), key='corr_year')
+    corr_matrix = corr_by_year[int(np.searchsorted(corr_years, corr_year))]
+
+    fig = charts.correlation_heatmap(corr_features, corr_matrix)
+    st.plotly_chart(fig)
 
 # Penjelasan umum
 st.write("Berdasarkan heatmap diatas, ada beberapa fitur target yang memiliki korelasi yang tinggi (>0.7) dengan fitur target human development, diantaranya:")
@@ -471,12 +310,47 @@ st.write("2. Fitur-fitur yang memiliki hubungan positif dengan fitur target, yan
 st.write("   - human development dan f_secondary_edu: 0.84")
 st.write("   - human development dan m_secondary_edu: 0.8")
 
+'\n'
+'\n'
 
+# Simulasi GII: dihitung ulang dari komponennya untuk semua negara-tahun sekaligus
+perf.mark('gii_what_if')
+st.subheader('Simulasi GII (What-if)')
 
-# Data Modeling
-# Load the saved model
-model = joblib.load('/Users/keiziapurba/xgb_model.pkl')
 
+@perf.shared
+def load_gii_components(data_version):
+    store = timeseries.open_store(time_series_path)
+    return gii.components(store), store.years, store.country_table()['country']
+
+
+gii_parts, gii_years, gii_countries = load_gii_components(data_cache.source_version(time_series_path))
+what_if_labels = {
+    'share of seats in parliament': 'pr_f',
+    'f_secondary_edu': 'se_f',
+    'f_labour_force': 'lfpr_f',
+    'maternal mortality ratio': 'mmr',
+    'adolescent birth rate': 'abr',
+}
+what_if_feature = st.selectbox('Komponen yang diubah:', list(what_if_labels))
+what_if_delta = st.slider('Perubahan (poin):', -50.0, 50.0, 10.0, step=1.0)
+what_if_year = st.slider('Year:', int(gii_years[0]), int(gii_years[-1]), int(gii_years[-1]), key='what_if_year')
+
+year_index = int(np.searchsorted(gii_years, what_if_year))
+gii_before = gii.compute(**gii_parts)[:, year_index]
+gii_after = gii.scenario(gii_parts, add={what_if_labels[what_if_feature]: what_if_delta})[:, year_index]
+col1, col2 = st.columns(2)
+col1.metric('Rata-rata GII', f'{np.nanmean(gii_before):.3f}')
+col2.metric('Rata-rata GII (simulasi)', f'{np.nanmean(gii_after):.3f}',
+            f'{np.nanmean(gii_after) - np.nanmean(gii_before):+.3f}', delta_color='inverse')
+what_if_table = pd.DataFrame({'country': gii_countries, 'gii value': gii_before, 'simulasi': gii_after})
+what_if_table['selisih'] = what_if_table['simulasi'] - what_if_table['gii value']
+st.dataframe(what_if_table.dropna().sort_values('selisih').head(10).round(3), use_container_width=True)
+
+
+
+# Data Modeling
+perf.mark('predictor')
 # Streamlit App
 '\n'
 '\n'
@@ -485,74 +359,120 @@ st.title('Human Development Category Prediction')
 
 '\n'
 
-# Input form
-st.subheader('Input Features')
-gii_value = st.number_input('GII Value')
-maternal_mortality_ratio = st.number_input('Maternal Mortality Ratio')
-adolescent_birth_rate = st.number_input('Adolescent Birth Rate')
-share_of_seats_in_parliament = st.number_input('Share of Seats in Parliament')
-f_secondary_edu = st.number_input('Female Secondary Education')
-m_secondary_edu = st.number_input('Male Secondary Education')
-f_labour_force = st.number_input('Female Labour Force')
-m_labour_force = st.number_input('Male Labour Force')
-region_east_asia_pacific = st.checkbox('Region: East Asia and the Pacific')
-region_europe_central_asia = st.checkbox('Region: Europe and Central Asia')
-region_latin_america_caribbean = st.checkbox('Region: Latin America and the Caribbean')
-region_middle_east_north_africa = st.checkbox('Region: Middle East and North Africa')
-region_north_america = st.checkbox('Region: North America')
-region_south_asia = st.checkbox('Region: South Asia')
-region_sub_saharan_africa = st.checkbox('Region: Sub-Saharan Africa')
-
-
-
-
-# Prepare input data
-input_data = {
-    'gii value': gii_value,
-    'maternal mortality ratio': maternal_mortality_ratio,
-    'adolescent birth rate': adolescent_birth_rate,
-    'share of seats in parliament': share_of_seats_in_parliament,
-    'f_secondary_edu': f_secondary_edu,
-    'm_secondary_edu': m_secondary_edu,
-    'f_labour_force': f_labour_force,
-    'm_labour_force': m_labour_force,
-    'region_East Asia and the Pacific': region_east_asia_pacific,
-    'region_Europe and Central Asia': region_europe_central_asia,
-    'region_Latin America and the Caribbean': region_latin_america_caribbean,
-    'region_Middle East and North Africa': region_middle_east_north_africa,
-    'region_North America': region_north_america,
-    'region_South Asia': region_south_asia,
-    'region_Sub-Saharan Africa': region_sub_saharan_africa
-}
+# Get prediction label
+prediction_labels = ['Low', 'Medium', 'High', 'Very High']
 
-# Create DataFrame from input data
-input_df = pd.DataFrame(input_data, index=[0])
+# Form prediksi ada di halaman sendiri (pages/1_Prediksi_HD.py): Streamlit 1.22
+# belum punya fragment, jadi submit di halaman utama akan menjalankan ulang seluruh dashboard
+st.write('Form prediksi ada di halaman **Prediksi HD** (menu di sidebar). Di halaman itu tombol '
+         '**Predict** hanya menjalankan ulang form prediksi, tidak seluruh dashboard.')
 
-# Make prediction
-prediction = model.predict(input_df)
 
-# Get prediction label
-prediction_labels = ['Low', 'Medium', 'High', 'Very High']
-prediction_label = prediction_labels[prediction[0]]
+'\n'
+
+st.write("Prediksi menggunakan model machine learning dengan algoritma XGBoost dengan skor precision pada test data sebesar 76% dan pada train data sebesar 95%. Model ini memiliki skor terbaik ketimbang model lainnya (Random Forest, KNN, dan Decision Tree).")
+
+'\n'
+
+# Prediksi untuk semua negara dan semua tahun di HDR21-22 time series
+perf.mark('trajectory')
+st.subheader('Predicted Human Development Trajectory')
 
 
+# Prediksi semua negara-tahun (dan model) baru dihitung bila bagian ini dibuka;
+# hasilnya di-cache per versi data dan model di batch_predict.py
+if st.checkbox('Tampilkan prediksi semua negara', key='show_trajectory'):
+    trajectory_store = timeseries.open_store(time_series_path)
+    batch = batch_predict.batch_predictions(trajectory_store)
+    trajectory_countries = st.multiselect('Select countries:', sorted(batch['country'].unique()),
+                                          default=['Indonesia', 'India', 'Brazil', 'Nigeria'])
+    # Garis putus-putus: kategori yang diprediksi dari proyeksi indikator sampai 2030
+    projected_batch = batch_predict.forecast_predictions(trajectory_store)
+    fig = charts.prediction_trajectories(batch, trajectory_countries, prediction_labels, projected_batch)
+    st.plotly_chart(fig, use_container_width=True)
 
 '\n'
 
-# Display the prediction
-st.subheader('Prediction')
-st.write('Human Development category:', prediction_label)
+# Proyeksi indikator sampai 2030, semua negara dihitung sekaligus (lihat forecast.py)
+perf.mark('forecast')
+st.subheader('Proyeksi Indikator sampai 2030')
+forecast_labels = {
+    'gii value': 'gii',
+    'maternal mortality ratio': 'mmr',
+    'adolescent birth rate': 'abr',
+    'share of seats in parliament': 'pr_f',
+    'f_secondary_edu': 'se_f',
+    'f_labour_force': 'lfpr_f',
+    'm_labour_force': 'lfpr_m',
+}
+forecast_store = timeseries.open_store(time_series_path)
+forecast_feature = st.selectbox('Indikator:', list(forecast_labels), key='forecast_feature')
+forecast_countries = st.multiselect('Negara:', sorted(forecast_store.country_table()['country']),
+                                    default=trends.DEFAULT_COUNTRIES, key='forecast_countries')
+fig = charts.forecast_lines(forecast.country_series(forecast_store, forecast.open_forecast(forecast_store),
+                                                    forecast_labels[forecast_feature], forecast_countries),
+                            forecast_feature)
+st.plotly_chart(fig, use_container_width=True)
+
+'\n'
 
+# Negara-tahun paling mirip berdasarkan 8 fitur yang distandarkan (lihat neighbours.py)
+perf.mark('similar_countries')
+st.subheader('Negara Serupa')
+similar_index = neighbours.open_index(timeseries.open_store(time_series_path))
+similar_countries = sorted(set(similar_index.columns['country']))
+# Rilis data tanpa Indonesia: mulai dari negara pertama
+similar_country = st.selectbox('Negara:', similar_countries,
+                               index=similar_countries.index('Indonesia') if 'Indonesia' in similar_countries else 0,
+                               key='similar_country')
+similar_years = sorted(similar_index.columns['year'][similar_index.columns['country'] == similar_country].tolist(),
+                       reverse=True)
+similar_year = st.selectbox('Tahun:', similar_years, key='similar_year')
+similar_k = st.slider('Jumlah negara:', 1, 20, neighbours.K, key='similar_k')
+st.dataframe(similar_index.similar_to(similar_country, similar_year, k=similar_k).round(3),
+             use_container_width=True)
 
 '\n'
 
-st.write("Prediksi diatas menggunakan model machine learning dengan algoritma XGBoost dengan skor precision pada test data sebesar 76% dan pada train data sebesar 95%. Model ini memiliki skor terbaik ketimbang model lainnya (Random Forest, KNN, dan Decision Tree).")
+# Analisis sensitivitas: grid ribuan baris diprediksi dalam satu panggilan
+perf.mark('sensitivity')
+st.subheader('Analisis Sensitivitas Prediksi')
+
+# Daftar negara dan tahun langsung dari store, tanpa menunggu batch prediction
+sensitivity_store = timeseries.open_store(time_series_path)
+sensitivity_countries = sorted(sensitivity_store.country_table()['country'])
+with st.form('sensitivity_form'):
+    sensitivity_country = st.selectbox('Negara dasar:', sensitivity_countries,
+                                       index=sensitivity_countries.index('Indonesia')
+                                       if 'Indonesia' in sensitivity_countries else 0)
+    sensitivity_year = st.selectbox('Tahun dasar:', sorted(sensitivity_store.years.tolist(), reverse=True))
+    sensitivity_x = st.selectbox('Fitur sumbu x:', model_registry.NUMERIC_FEATURES, index=0)
+    sensitivity_y = st.selectbox('Fitur sumbu y:', ['(tidak ada)'] + model_registry.NUMERIC_FEATURES,
+                                 index=1 + model_registry.NUMERIC_FEATURES.index('f_secondary_edu'))
+    if st.form_submit_button('Jalankan'):
+        st.session_state['sensitivity'] = (sensitivity_country, sensitivity_year, sensitivity_x, sensitivity_y)
+
+# Model baru dimuat setelah form dikirim; hasil grid di-cache di sensitivity.py
+if 'sensitivity' in st.session_state:
+    country, year, x_feature, y_feature = st.session_state['sensitivity']
+    features = batch_predict.build_features(sensitivity_store)
+    base = features[(features['country'] == country) & (features['year'] == year)].iloc[0]
+    if y_feature == '(tidak ada)':
+        result = sensitivity.sweep(base, x_feature, sensitivity.feature_bounds(features, x_feature),
+                                   grid_size=500)
+        fig = charts.class_probability_lines(result, prediction_labels)
+    else:
+        result = sensitivity.sweep(base, x_feature, sensitivity.feature_bounds(features, x_feature),
+                                   y_feature, sensitivity.feature_bounds(features, y_feature))
+        fig = charts.decision_heatmap(result, prediction_labels, base)
+    st.plotly_chart(fig, use_container_width=True)
 
 
 
 '\n'
 
 # About
+perf.mark('footer')
 st.sidebar.subheader('About')
 st.sidebar.write('This app is an interactive exploration of the Gender Inequality Index dataset. '
                  'It provides visualizations and insights into various aspects of gender inequality. '
@@ -643,3 +563,12 @@ for i, source in enumerate(sources):
         f"{i+1}. [<span style='font-size:small'>{source['name']}</span>]({source['link']})",
         unsafe_allow_html=True
     )
+
+perf.finish_rerun()
+if debug_mode:
+    perf.debug_panel()
+
+# Pohon model dimuat sekali per proses di background thread setelah halaman selesai
+# dirender, jadi siap sebelum form prediksi dikirim tanpa memperlambat cold start.
+# Sweep sensitivitas dan batch prediction memakai XGBoost (model_registry.py).
+model_registry.warm_in_background(loader=compiled_model.open_compiled)
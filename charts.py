@@ -0,0 +1,242 @@
+import json
+
+import numpy as np
+
+from regions import region_of
+
+
+# Plotly di-import di dalam fungsi supaya proses baru tidak membayarnya
+# sebelum chart pertama benar-benar dibuat
+
+# Set color palette
+color_palette = ['#005A8D', '#FF6363', '#FFBD69', '#7BC950', '#843FA1']
+
+
+def hd_bar(dv1):
+    import plotly.express as px
+
+    fig = px.bar(dv1, x='human development', y='count', color='human development',
+                 color_discrete_sequence=color_palette)
+    fig.update_layout(
+        xaxis=dict(title='Human Development'),
+        yaxis=dict(title='Count'),
+        showlegend=False
+    )
+    return fig
+
+
+def region_pie(dv2, value='gii value', value_label='GII Value'):
+    import plotly.express as px
+
+    fig = px.pie(dv2, values=value, names='region', hole=0.4,
+                 color='color', color_discrete_map={'blue': 'blue', 'gray': 'lightgray'},
+                 labels={'region': 'Region', value: value_label})
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def correlation_scatter(df_clean, x_label, y_label):
+    import plotly.express as px
+
+    scatter_plot = px.scatter(df_clean, x=x_label, y=y_label, color='region',
+                              color_discrete_sequence=px.colors.qualitative.Pastel1)
+    scatter_plot.update_layout(
+        xaxis=dict(title=x_label),
+        yaxis=dict(title=y_label),
+        showlegend=True
+    )
+    return scatter_plot
+
+
+def trend_lines(traces, y_title):
+    """Female (solid) and male (dashed) lines per country, one color per country."""
+    import plotly.graph_objects as go
+    import plotly.express as px
+
+    palette = px.colors.qualitative.Plotly
+    countries = list(dict.fromkeys(t['country'] for t in traces))
+    fig = go.Figure()
+    for t in traces:
+        fig.add_trace(go.Scatter(
+            x=t['years'], y=t['values'], mode='lines', name=f"{t['country']} ({t['sex']})",
+            legendgroup=t['country'],
+            line=dict(color=palette[countries.index(t['country']) % len(palette)],
+                      dash='solid' if t['sex'] == 'Female' else 'dash'),
+        ))
+    fig.update_layout(xaxis_title='Year', yaxis_title=y_title)
+    return fig
+
+
+def gii_map(store):
+    """GII choropleth keyed on ISO3, serialized once per data version.
+
+    Returns ``(figure_json, years, colors)`` where ``colors[:, i]`` is the
+    color array for ``years[i]``. Switching year only swaps ``z`` in the
+    figure dict, the geometry and layout are never rebuilt.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    countries = store.country_table()
+    colors, years = store.matrix('gii')
+    regions = [region_of(c, r) for c, r in zip(countries['country'], countries['region'])]
+
+    fig = go.Figure(go.Choropleth(
+        locations=countries['iso3'],
+        locationmode='ISO-3',
+        z=colors[:, -1],
+        text=[f'{c}<br>{r}' for c, r in zip(countries['country'], regions)],
+        hovertemplate='%{text}<br>GII Value: %{z:.3f}<extra></extra>',
+        colorscale='Viridis',
+        zmin=float(np.nanmin(colors)),
+        zmax=float(np.nanmax(colors)),
+        colorbar=dict(title='GII Value'),
+    ))
+    fig.update_layout(
+        geo=dict(showframe=False, showcoastlines=False, projection_type='equirectangular')
+    )
+    return pio.to_json(fig), years, colors
+
+
+def with_year(figure_json, years, colors, year):
+    """Figure dict for ``year`` built from the cached JSON."""
+    figure = json.loads(figure_json)
+    z = colors[:, int(np.searchsorted(years, year))]
+    figure['data'][0]['z'] = np.where(np.isnan(z), None, z).tolist()
+    return figure
+
+
+def correlation_heatmap(features, corr_matrix):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix,
+        x=features,
+        y=features,
+        text=np.round(corr_matrix, 2),  # Menambahkan nilai angka ke dalam kotak
+        colorscale='RdBu',
+        zmin=-1,
+        zmax=1,
+        colorbar=dict(title='Correlation')
+    ))
+
+    fig.update_layout(
+        xaxis_tickangle=-55,
+        yaxis_tickangle=0,
+        width=700,
+        height=700,
+        title='Correlation Heatmap'
+    )
+
+    fig.update_traces(hovertemplate='Correlation: %{text}')  # Menampilkan angka saat dihover
+    return fig
+
+
+def prediction_trajectories(batch, countries, prediction_labels, projected=None):
+    """Predicted category per year; ``projected`` adds the forecast years dashed.
+
+    Years that were not scored (prediction -1, too few features) are gaps.
+    """
+    import plotly.graph_objects as go
+    import plotly.express as px
+
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, country in enumerate(countries):
+        color = palette[i % len(palette)]
+        rows = batch[batch['country'] == country]
+        fig.add_trace(go.Scatter(x=rows['year'], y=rows['prediction'].where(rows['prediction'] >= 0),
+                                 mode='lines+markers', name=country,
+                                 text=rows['prediction_label'], hovertemplate='%{x}: %{text}',
+                                 line=dict(color=color), legendgroup=country))
+        if projected is not None:
+            rows = projected[projected['country'] == country]
+            fig.add_trace(go.Scatter(x=rows['year'], y=rows['prediction'].where(rows['prediction'] >= 0),
+                                     mode='lines+markers',
+                                     name=f'{country} (proyeksi)', text=rows['prediction_label'],
+                                     hovertemplate='%{x}: %{text}', legendgroup=country, showlegend=False,
+                                     line=dict(color=color, dash='dot')))
+    fig.update_layout(
+        xaxis_title='Year',
+        yaxis=dict(title='Human Development', tickvals=[0, 1, 2, 3], ticktext=prediction_labels)
+    )
+    return fig
+
+
+def forecast_lines(series, y_title):
+    """Observed values (solid) and projection (dotted) per country."""
+    import plotly.graph_objects as go
+    import plotly.express as px
+
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, s in enumerate(series):
+        color = palette[i % len(palette)]
+        fig.add_trace(go.Scatter(x=s['years'], y=s['values'], mode='lines', name=s['country'],
+                                 legendgroup=s['country'], line=dict(color=color)))
+        fig.add_trace(go.Scatter(x=s['forecast_years'], y=s['forecast_values'], mode='lines',
+                                 name=f"{s['country']} (proyeksi)", legendgroup=s['country'], showlegend=False,
+                                 line=dict(color=color, dash='dot')))
+    fig.update_layout(xaxis_title='Year', yaxis_title=y_title)
+    return fig
+
+
+def decision_heatmap(result, prediction_labels, base=None):
+    """Predicted class over a 2-D sensitivity grid (see sensitivity.sweep)."""
+    import plotly.graph_objects as go
+
+    n_classes = len(prediction_labels)
+    # Colorscale diskret: satu warna per kategori human development
+    colorscale = []
+    for i, color in enumerate(color_palette[:n_classes]):
+        colorscale += [[i / n_classes, color], [(i + 1) / n_classes, color]]
+    fig = go.Figure(go.Heatmap(
+        x=result['x_values'],
+        y=result['y_values'],
+        z=result['classes'],
+        zmin=-0.5,
+        zmax=n_classes - 0.5,
+        colorscale=colorscale,
+        colorbar=dict(tickvals=list(range(n_classes)), ticktext=prediction_labels),
+        hovertemplate=f"{result['x_feature']}: %{{x:.3f}}<br>{result['y_feature']}: %{{y:.3f}}<extra></extra>",
+    ))
+    if base is not None:
+        fig.add_trace(go.Scatter(x=[base[result['x_feature']]], y=[base[result['y_feature']]],
+                                 mode='markers', marker=dict(color='black', size=10, symbol='x'),
+                                 name='Base', showlegend=False))
+    fig.update_layout(xaxis_title=result['x_feature'], yaxis_title=result['y_feature'])
+    return fig
+
+
+def class_probability_lines(result, prediction_labels):
+    """Class probabilities along a 1-D sensitivity sweep."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for i, label in enumerate(prediction_labels):
+        fig.add_trace(go.Scatter(x=result['x_values'], y=result['proba'][:, i], mode='lines', name=label,
+                                 line=dict(color=color_palette[i])))
+    fig.update_layout(xaxis_title=result['x_feature'], yaxis_title='Probability')
+    return fig
+
+
+def year_slider(figures, years, active=-1):
+    """One figure whose built-in slider switches between per-year ``figures``.
+
+    Every year becomes a Plotly frame, so the slider runs in the browser
+    without a rerun. The figures must have the same traces in the same order.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(figures[active])
+    fig.frames = [go.Frame(data=f.data, name=str(year)) for f, year in zip(figures, years)]
+    fig.update_layout(sliders=[dict(
+        active=len(figures) - 1 if active == -1 else active,
+        currentvalue=dict(prefix='Year: '),
+        steps=[dict(method='animate', label=str(year),
+                    args=[[str(year)], dict(mode='immediate', frame=dict(duration=0, redraw=True),
+                                            transition=dict(duration=0))])
+               for year in years],
+    )])
+    return fig
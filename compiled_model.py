@@ -0,0 +1,211 @@
+"""NumPy evaluator for the exported trees of the HD-category XGBoost model.
+
+The booster's trees are flattened once into padded (tree, node) arrays of
+split features, float32 thresholds, children, default directions and leaf
+values, and saved next to the other caches keyed on the model's sha256.
+Scoring walks all trees for a whole batch at once, one depth level per
+step, so neither xgboost nor a DataFrame is needed at request time:
+
+    python compiled_model.py [--model PATH]
+
+exports the model and checks it against ``model.predict`` on every
+country-year of the time series.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import data_cache
+import model_registry
+
+
+CHUNK_SIZE = 4096
+
+_models = data_cache.VersionedCache('open_compiled')
+
+
+def export(model):
+    """Flatten the trees of an XGBClassifier into a dict of NumPy arrays.
+
+    Every tree is laid out as a complete binary tree of the booster's depth
+    (children of node i at 2i+1 and 2i+2). A leaf above the last level gets
+    pass-through splits that always go left, and its value is repeated over
+    the leaf slots below it. The default direction for missing values is
+    folded into the split feature: codes >= n_features read a copy of the
+    input where NaN is -inf (goes left), the others a copy where NaN is +inf.
+    """
+    learner = json.loads(model.get_booster().save_raw(raw_format='json'))['learner']
+    booster = learner['gradient_booster']['model']
+    trees = booster['trees']
+    if any(any(tree['split_type']) for tree in trees):
+        raise ValueError('split kategorikal tidak didukung')
+    n_features = int(learner['learner_model_param']['num_feature'])
+
+    def node_depth(tree, node):
+        if tree['left_children'][node] == -1:
+            return 0
+        return 1 + max(node_depth(tree, tree['left_children'][node]), node_depth(tree, tree['right_children'][node]))
+
+    depth = max(node_depth(tree, 0) for tree in trees)
+    n_internal = 2 ** depth - 1
+    feature = np.full((len(trees), n_internal), n_features, dtype='i2')
+    threshold = np.full((len(trees), n_internal), np.inf, dtype='float32')
+    leaf_value = np.zeros((len(trees), 2 ** depth), dtype='float32')
+
+    for t, tree in enumerate(trees):
+        stack = [(0, 0)]  # (node xgboost, posisi di pohon lengkap)
+        while stack:
+            node, position = stack.pop()
+            if position >= n_internal:
+                leaf_value[t, position - n_internal] = tree['split_conditions'][node]
+            elif tree['left_children'][node] == -1:
+                # Daun di tengah: split semu (threshold inf pada salinan NaN -> -inf) selalu ke kiri
+                stack += [(node, 2 * position + 1), (node, 2 * position + 2)]
+            else:
+                feature[t, position] = tree['split_indices'][node] + n_features * tree['default_left'][node]
+                threshold[t, position] = tree['split_conditions'][node]
+                stack += [(tree['left_children'][node], 2 * position + 1),
+                          (tree['right_children'][node], 2 * position + 2)]
+
+    params = learner['learner_model_param']
+    return {
+        'feature': feature,
+        'threshold': threshold,
+        'leaf_value': leaf_value,
+        'tree_class': np.array(booster['tree_info'], dtype='i2'),
+        'base_score': np.float32(params['base_score']),
+        'n_classes': np.int16(max(int(params['num_class']), 1)),
+        'feature_names': np.array(learner['feature_names'] or model_registry.FEATURE_COLUMNS),
+    }
+
+
+class CompiledModel:
+    """``predict`` / ``predict_proba`` over exported tree arrays."""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.feature_names = [str(name) for name in arrays['feature_names']]
+        self.n_classes = int(arrays['n_classes'])
+        n_trees, n_internal = arrays['feature'].shape
+        self.depth = int(np.log2(n_internal + 1))
+        # Indeks global (tree, node) supaya setiap level cukup satu take() datar
+        offset = np.arange(n_trees, dtype='i4') * n_internal
+        self._start = offset
+        self._step = 1 - offset
+        self._leaf_offset = np.arange(n_trees, dtype='i4') * (n_internal + 1) - n_internal - offset
+        self._feature = arrays['feature'].ravel().astype('i4')
+        self._threshold = arrays['threshold'].ravel()
+        self._leaf_value = arrays['leaf_value'].ravel()
+        self._class_of_tree = np.eye(self.n_classes, dtype='float32')[arrays['tree_class']]
+
+    def features(self, X):
+        """float32 matrix in the model's feature order (DataFrame or array input)."""
+        if hasattr(X, 'columns'):
+            X = X[self.feature_names].to_numpy(dtype='float32')
+        return np.ascontiguousarray(X, dtype='float32')
+
+    def predict_margin(self, X, chunk_size=CHUNK_SIZE):
+        X = self.features(X)
+        missing = np.isnan(X)
+        # Kolom 0..n-1: NaN -> +inf (ke kanan); kolom n..2n-1: NaN -> -inf (ke kiri)
+        X = np.concatenate([np.where(missing, np.inf, X), np.where(missing, -np.inf, X)], axis=1)
+        n_columns = X.shape[1]
+        margin = np.empty((len(X), self.n_classes), dtype='float32')
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size].ravel()
+            row = np.arange(len(chunk) // n_columns, dtype='i4')[:, None] * n_columns
+            node = np.repeat(self._start[None, :], len(row), axis=0)
+            for _ in range(self.depth):
+                right = chunk.take(row + self._feature.take(node)) >= self._threshold.take(node)
+                node = 2 * node + self._step + right
+            leaves = self._leaf_value.take(node + self._leaf_offset)
+            margin[start:start + len(row)] = leaves @ self._class_of_tree + self.arrays['base_score']
+        return margin
+
+    def predict_proba(self, X):
+        margin = self.predict_margin(X)
+        margin -= margin.max(axis=1, keepdims=True)
+        proba = np.exp(margin)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.predict_margin(X).argmax(axis=1)
+
+
+def _compiled_path(model_sha):
+    return os.path.join(data_cache.CACHE_DIR, f'compiled-{model_sha[:16]}.npz')
+
+
+def save(arrays, model_sha):
+    data_cache.save_arrays(_compiled_path(model_sha), **arrays)
+
+
+def load(model_sha):
+    return data_cache.load_arrays(_compiled_path(model_sha))
+
+
+def open_compiled(path=model_registry.MODEL_PATH):
+    """Compiled model for the artifact at ``path``, exported once per model hash.
+
+    Only the first export imports xgboost; later processes load the arrays.
+    """
+    sha256 = data_cache.source_version(path)
+
+    def load_or_export():
+        arrays = load(sha256)
+        if arrays is None:
+            arrays = export(model_registry.get_model(path).model)
+            save(arrays, sha256)
+        return CompiledModel(arrays)
+
+    return _models.get(sha256, load_or_export)
+
+
+def verify(store, path=model_registry.MODEL_PATH):
+    """Compare the compiled model with ``model.predict`` on every country-year of ``store``."""
+    from batch_predict import build_features
+
+    features = build_features(store)[model_registry.FEATURE_COLUMNS]
+    model = model_registry.get_model(path).model
+    compiled = open_compiled(path)
+
+    start = time.perf_counter()
+    expected = model.predict(features)
+    expected_proba = model.predict_proba(features)
+    xgboost_s = time.perf_counter() - start
+    start = time.perf_counter()
+    X = compiled.features(features)
+    predicted = compiled.predict(X)
+    proba = compiled.predict_proba(X)
+    compiled_s = time.perf_counter() - start
+    return {
+        'rows': len(features),
+        'mismatches': int((predicted != expected).sum()),
+        'max_proba_diff': float(np.abs(proba - expected_proba).max()),
+        'xgboost_s': xgboost_s,
+        'compiled_s': compiled_s,
+    }
+
+
+def main():
+    import timeseries
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--model', default=model_registry.MODEL_PATH)
+    parser.add_argument('--time-series', default=data_cache.TIME_SERIES_PATH)
+    args = parser.parse_args()
+
+    report = verify(timeseries.open_store(args.time_series), args.model)
+    print(f"{report['rows']} country-years: {report['mismatches']} class mismatches, "
+          f"max |proba diff| {report['max_proba_diff']:.2e}")
+    print(f"xgboost predict+proba {report['xgboost_s'] * 1000:.1f} ms, "
+          f"compiled {report['compiled_s'] * 1000:.1f} ms")
+    if report['mismatches']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
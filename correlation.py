@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+
+import data_cache
+from batch_predict import FEATURE_SOURCES
+from timeseries import hd_group_codes
+
+
+# Fitur heatmap: sama dengan heatmap 2021, 'human development' diturunkan dari HDI tiap tahun
+HEATMAP_FEATURES = ['human development'] + list(FEATURE_SOURCES)
+MIN_PERIODS = 3
+
+_results = data_cache.VersionedCache('open_correlations')
+
+
+def feature_cube(store):
+    """(year, country, feature) float64 array for HEATMAP_FEATURES."""
+    columns = [hd_group_codes(store.matrix('hdi')[0])]
+    columns += [store.matrix(indicator)[0] for indicator in FEATURE_SOURCES.values()]
+    return np.stack(columns, axis=-1).transpose(1, 0, 2).astype('float64')
+
+
+def pairwise_corr(X, min_periods=MIN_PERIODS):
+    """Pearson correlation per leading slice with pairwise NaN handling.
+
+    ``X`` has shape (slice, row, feature). For every pair (i, j) only rows
+    where both values are present are used, like ``DataFrame.corr()``, but
+    all slices are computed in one batch of einsum reductions.
+    """
+    mask = ~np.isnan(X)
+    M = mask.astype('float64')
+    Xz = np.where(mask, X, 0.0)
+
+    n = np.einsum('sri,srj->sij', M, M)
+    sx = np.einsum('sri,srj->sij', Xz, M)
+    sxx = np.einsum('sri,srj->sij', Xz * Xz, M)
+    sxy = np.einsum('sri,srj->sij', Xz, Xz)
+    sy = sx.transpose(0, 2, 1)
+    syy = sxx.transpose(0, 2, 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[n < min_periods] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+def yearly_correlations(store):
+    """Return ``(years, features, corr)`` with corr shaped (year, feature, feature)."""
+    corr = pairwise_corr(feature_cube(store)).astype('float32')
+    return store.years, HEATMAP_FEATURES, corr
+
+
+def update_correlations(previous, store, years):
+    """Recompute only the changed ``years`` of a previous ``yearly_correlations`` result."""
+    prev_years, features, corr = previous
+    if features != HEATMAP_FEATURES or not np.array_equal(prev_years, store.years):
+        return yearly_correlations(store)
+    corr = corr.copy()
+    year_index = np.flatnonzero(np.isin(store.years, years))
+    if len(year_index):
+        corr[year_index] = pairwise_corr(feature_cube(store)[year_index]).astype('float32')
+    return store.years, HEATMAP_FEATURES, corr
+
+
+def _result_path(version):
+    return os.path.join(data_cache.CACHE_DIR, f'correlations-{version[:16]}.npz')
+
+
+def save(result, version):
+    years, _, corr = result
+    data_cache.save_arrays(_result_path(version), years=years, corr=corr)
+
+
+def load(version):
+    """Saved ``(years, features, corr)`` for ``version`` or None."""
+    saved = data_cache.load_arrays(_result_path(version))
+    if saved is None:
+        return None
+    return saved['years'], HEATMAP_FEATURES, saved['corr']
+
+
+def open_correlations(store):
+    """``yearly_correlations`` for the store's version, computed once and saved."""
+    def load_or_build():
+        result = load(store.version)
+        if result is None:
+            result = yearly_correlations(store)
+            save(result, store.version)
+        return result
+
+    return _results.get(store.version, load_or_build)
@@ -0,0 +1,157 @@
+"""Materialized aggregates over region x HD group x year x indicator.
+
+Built once per time-series version from the (country, year) matrices of the
+store, saved next to the store and shared per process. Every chart slice is
+then a plain array index instead of a groupby over row data.
+"""
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+import timeseries
+from batch_predict import country_regions
+
+
+INDICATORS = ['hdi', 'gii', 'mmr', 'abr', 'pr_f', 'pr_m', 'se_f', 'se_m', 'lfpr_f', 'lfpr_m']
+HD_GROUPS = ['Low', 'Medium', 'High', 'Very High', 'Other']
+QUANTILES = [0.10, 0.25, 0.50, 0.75, 0.90]
+STATS = ['count', 'mean', 'median', 'q10', 'q25', 'q75', 'q90']
+ALL = 'All'
+
+# Label di dashboard -> indikator untuk pie chart per region
+REGION_INDICATORS = {
+    'gii value': 'gii',
+    'maternal mortality ratio': 'mmr',
+    'adolescent birth rate': 'abr',
+    'share of seats in parliament': 'pr_f',
+    'f_secondary_edu': 'se_f',
+    'f_labour_force': 'lfpr_f',
+}
+
+_cubes = data_cache.VersionedCache('open_cube')
+
+
+class AggregateCube:
+    """``values[region, hd, year, indicator, stat]`` with name lookups.
+
+    The last entry of the region and HD axes is the ``'All'`` margin.
+    """
+
+    def __init__(self, values, regions, years):
+        self.values = values
+        self.regions = list(regions)
+        self.hd_groups = HD_GROUPS + [ALL]
+        self.years = np.asarray(years, dtype='i2')
+        self._region = {name: i for i, name in enumerate(self.regions)}
+        self._hd = {name: i for i, name in enumerate(self.hd_groups)}
+        self._indicator = {name: i for i, name in enumerate(INDICATORS)}
+        self._stat = {name: i for i, name in enumerate(STATS)}
+
+    def _year(self, year):
+        return int(year) - int(self.years[0])
+
+    def get(self, region, hd, year, indicator, stat='mean'):
+        return float(self.values[self._region[region], self._hd[hd], self._year(year),
+                                 self._indicator[indicator], self._stat[stat]])
+
+    def by_hd(self, year, indicator='hdi', stat='count', region=ALL):
+        """Series over the HD groups (without the margin) for one slice."""
+        row = self.values[self._region[region], :-1, self._year(year),
+                          self._indicator[indicator], self._stat[stat]]
+        return pd.Series(row, index=HD_GROUPS, name=stat)
+
+    def by_region(self, year, indicator='gii', stat='mean', hd=ALL):
+        """Series over the regions (without the margin) for one slice."""
+        row = self.values[:-1, self._hd[hd], self._year(year),
+                          self._indicator[indicator], self._stat[stat]]
+        return pd.Series(row, index=self.regions[:-1], name=stat)
+
+
+def _region_codes(store):
+    regions = sorted(set(country_regions(store)) - {'Unknown'})
+    codes = np.array([regions.index(r) if r in regions else -1 for r in country_regions(store)])
+    return regions, codes[:, None]
+
+
+def _fill(values, store, regions, region_codes, year_index):
+    """Compute the cells of ``values`` for the years at ``year_index``."""
+    hdi = store.matrix('hdi')[0][:, year_index]
+    hd_codes = timeseries.hd_group_codes(hdi)
+    # HDI kosong -> kelompok 'Other', sama seperti kategori di schema.HD_CATEGORIES
+    hd_codes = np.where(np.isnan(hd_codes), HD_GROUPS.index('Other'), hd_codes).astype('i1')
+
+    cube = np.stack([store.matrix(name)[0][:, year_index] for name in INDICATORS], axis=-1)
+    cube = cube.astype('float64')
+    in_region = [region_codes == r for r in range(len(regions))] + [region_codes >= 0]
+    in_hd = [hd_codes == h for h in range(len(HD_GROUPS))] + [np.ones_like(hd_codes, dtype=bool)]
+    with warnings.catch_warnings():
+        # sel kosong (mis. South Asia x Very High) menghasilkan NaN, bukan error
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for r, region_mask in enumerate(in_region):
+            for h, hd_mask in enumerate(in_hd):
+                masked = np.where((region_mask & hd_mask)[:, :, None], cube, np.nan)
+                cell = np.empty(masked.shape[1:] + (len(STATS),), dtype='float32')
+                cell[..., 0] = (~np.isnan(masked)).sum(axis=0)
+                cell[..., 1] = np.nanmean(masked, axis=0)
+                quantiles = np.nanquantile(masked, QUANTILES, axis=0)
+                cell[..., 2] = quantiles[2]
+                cell[..., 3:5] = np.moveaxis(quantiles[:2], 0, -1)
+                cell[..., 5:7] = np.moveaxis(quantiles[3:], 0, -1)
+                values[r, h, year_index] = cell
+
+
+def build(store):
+    """Aggregate every indicator for all region/HD/year cells, margins included."""
+    regions, region_codes = _region_codes(store)
+    values = np.full((len(regions) + 1, len(HD_GROUPS) + 1, len(store.years), len(INDICATORS), len(STATS)),
+                     np.nan, dtype='float32')
+    _fill(values, store, regions, region_codes, np.arange(len(store.years)))
+    return AggregateCube(values, regions + [ALL], store.years)
+
+
+def update(previous, store, years):
+    """Cube for ``store`` reusing ``previous`` outside the changed ``years``.
+
+    Falls back to a full build when the year axis or region list changed.
+    """
+    regions, region_codes = _region_codes(store)
+    if (regions + [ALL] != previous.regions or len(previous.years) != len(store.years)
+            or (previous.years != store.years).any()):
+        return build(store)
+    values = previous.values.copy()
+    year_index = np.flatnonzero(np.isin(store.years, years))
+    if len(year_index):
+        _fill(values, store, regions, region_codes, year_index)
+    return AggregateCube(values, previous.regions, store.years)
+
+
+def _cube_path(version):
+    return os.path.join(data_cache.CACHE_DIR, f'cube-{version[:16]}.npz')
+
+
+def save(cube, version):
+    data_cache.save_arrays(_cube_path(version), values=cube.values, regions=np.array(cube.regions),
+                           years=cube.years)
+
+
+def load(version):
+    """Saved cube for ``version`` or None."""
+    saved = data_cache.load_arrays(_cube_path(version))
+    if saved is None:
+        return None
+    return AggregateCube(saved['values'], saved['regions'].tolist(), saved['years'])
+
+
+def open_cube(store):
+    """Cube for the store's version, loaded from disk or built once per process."""
+    def load_or_build():
+        cube = load(store.version)
+        if cube is None:
+            cube = build(store)
+            save(cube, store.version)
+        return cube
+
+    return _cubes.get(store.version, load_or_build)
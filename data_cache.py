@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+# Folder untuk salinan columnar (Parquet) dari file sumber
+CACHE_DIR = os.environ.get(
+    'GII_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+
+# Lokasi file sumber, bisa diganti lewat environment variable (seperti GII_MODEL_PATH)
+DATA_PATH = os.environ.get('GII_DATA_PATH', '/Users/keiziapurba/gender_inequality_index.xlsx')
+TIME_SERIES_PATH = os.environ.get('GII_TIME_SERIES_PATH',
+                                  '/Users/keiziapurba/HDR21-22_Composite_indices_complete_time_series.csv')
+ANNEX_PATH = os.environ.get('GII_ANNEX_PATH', '/Users/keiziapurba/HDR21-22_Statistical_Annex_GII_Table.xlsx')
+
+# Explicit dtypes so the cached copy never depends on openpyxl/CSV inference
+GII_WORKBOOK_DTYPES = {
+    'HDI rank': 'int64',
+    'Country': 'object',
+    'Human Development': 'object',
+    'GII Value': 'float64',
+    'GII Rank': 'float64',
+    'Maternal mortality ratio': 'float64',
+    'Adolescent birth rate': 'float64',
+    'Share of seats in parliament': 'float64',
+    'F_secondary_edu': 'float64',
+    'M_secondary_edu': 'float64',
+    'F_labour_force': 'float64',
+    'M_labour_force': 'float64',
+}
+
+# Time series: 4 key columns, every other column is a float indicator-year
+TIME_SERIES_KEY_DTYPES = {
+    'iso3': 'object',
+    'country': 'object',
+    'hdicode': 'object',
+    'region': 'object',
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tmp_path(path):
+    # Unik per proses/thread supaya penulisan paralel tidak saling menimpa
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+@contextmanager
+def atomic_write(path, mode='wb'):
+    """Write ``path`` through a temporary file that replaces it only on success.
+
+    Readers in other processes see the old file or the complete new one,
+    never a partial write; the temporary file is removed if the block raises.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = tmp_path(path)
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_arrays(path, **arrays):
+    with atomic_write(path) as f:
+        np.savez(f, **arrays)
+
+
+def load_arrays(path):
+    """Arrays saved with ``save_arrays`` as a dict, or None if ``path`` does not exist."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as saved:
+        return {name: saved[name] for name in saved.files}
+
+
+# Dipanggil dengan (nama cache, hit) pada setiap VersionedCache.get; perf.py mendaftarkan penghitungnya
+_lookup_hooks = []
+
+
+def on_cache_lookup(hook):
+    """Register ``hook(name, hit)`` to be called on every ``VersionedCache.get``."""
+    _lookup_hooks.append(hook)
+
+
+class VersionedCache:
+    """Process-wide results keyed on a data version or model hash.
+
+    Only the ``keep`` most recently used keys are held, so results of
+    superseded versions are released instead of piling up in a long-running
+    server. ``get`` builds a missing value under the cache's lock, once per
+    process; None is returned but not cached. Every lookup is reported to the
+    ``on_cache_lookup`` hooks under ``name``.
+    """
+
+    def __init__(self, name, keep=1):
+        self.name = name
+        self.keep = keep
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            hit = key in self._items
+            if hit:
+                self._items.move_to_end(key)
+                value = self._items[key]
+            else:
+                value = build()
+                if value is not None:
+                    self._items[key] = value
+                    while len(self._items) > self.keep:
+                        self._items.popitem(last=False)
+        for hook in _lookup_hooks:
+            hook(self.name, hit)
+        return value
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _source_key(path):
+    """File stem plus a hash of the absolute path, unique per source file."""
+    location = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:12]
+    return f'{os.path.splitext(os.path.basename(path))[0]}-{location}'
+
+
+def _manifest_path(path):
+    return os.path.join(CACHE_DIR, _source_key(path) + '.manifest.json')
+
+
+def _read_manifest(path):
+    try:
+        with open(_manifest_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(path, manifest):
+    with atomic_write(_manifest_path(path), 'w') as f:
+        json.dump(manifest, f)
+
+
+def source_version(path):
+    """Return the sha256 of ``path``, hashing only when mtime/size changed."""
+    stat = os.stat(path)
+    manifest = _read_manifest(path)
+    if (manifest is not None and manifest['mtime_ns'] == stat.st_mtime_ns
+            and manifest['size'] == stat.st_size):
+        return manifest['sha256']
+
+    sha256 = file_sha256(path)
+    if manifest is None or manifest['sha256'] != sha256:
+        # Sumber berubah: salinan lama tidak berlaku lagi
+        for old_file in (manifest or {}).get('files', {}).values():
+            if os.path.exists(old_file):
+                os.remove(old_file)
+        manifest = {'sha256': sha256, 'files': {}}
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    manifest['size'] = stat.st_size
+    _write_manifest(path, manifest)
+    return sha256
+
+
+def cached_frame(path, reader, dtypes, kind='frame'):
+    """Load ``reader(path)`` from a Parquet copy keyed on the source hash.
+
+    The first call for a given source version parses the original file,
+    enforces ``dtypes`` and writes the Parquet copy; later calls (also from
+    fresh worker processes) only read the Parquet file.
+    """
+    sha256 = source_version(path)
+    manifest = _read_manifest(path)
+    # Per file sumber, supaya sumber lain dengan nama sama tidak menghapusnya
+    cache_file = os.path.join(CACHE_DIR, f'{_source_key(path)}-{kind}-{sha256[:16]}.parquet')
+
+    if manifest['files'].get(kind) == cache_file and os.path.exists(cache_file):
+        return pd.read_parquet(cache_file)
+
+    df = reader(path)
+    if callable(dtypes):
+        dtypes = dtypes(df)
+    df = df.astype(dtypes)
+    with atomic_write(cache_file) as f:
+        df.to_parquet(f, index=False)
+
+    old_file = manifest['files'].get(kind)
+    if old_file and old_file != cache_file and os.path.exists(old_file):
+        os.remove(old_file)
+    manifest['files'][kind] = cache_file
+    _write_manifest(path, manifest)
+    return df.reset_index(drop=True)
+
+
+def _time_series_dtypes(df):
+    dtypes = {column: 'float64' for column in df.columns}
+    dtypes.update(TIME_SERIES_KEY_DTYPES)
+    return dtypes
+
+
+def load_gii_workbook(path):
+    return cached_frame(path, pd.read_excel, GII_WORKBOOK_DTYPES)
+
+
+def load_time_series(path):
+    return cached_frame(path, pd.read_csv, _time_series_dtypes)
+
+
+if __name__ == '__main__':
+    # Warm the cache ahead of time, e.g. during deployment:
+    #   python data_cache.py gender_inequality_index.xlsx HDR21-22_*.csv HDR21-22_*.xlsx
+    import sys
+    import time
+
+    from annex import load_annex_gii
+
+    loaders = {'.csv': load_time_series}
+    for source in sys.argv[1:]:
+        name = os.path.basename(source)
+        if name.startswith('HDR21-22_Statistical_Annex'):
+            loader = load_annex_gii
+        else:
+            loader = loaders.get(os.path.splitext(name)[1], load_gii_workbook)
+        start = time.perf_counter()
+        frame = loader(source)
+        print(f'{name}: {frame.shape[0]} rows x {frame.shape[1]} cols '
+              f'in {time.perf_counter() - start:.3f}s')
@@ -0,0 +1,95 @@
+"""Process-wide, read-only GII dataset shared by every Streamlit session.
+
+``st.cache_data`` unpickles a fresh copy of its result for every caller.
+The workbook and its derived frames are instead built once per source
+version and kept as Arrow tables. The pandas frames are converted with
+``split_blocks=True``, so every column is a read-only NumPy view over the
+Arrow buffers and writing into it raises. ``view()`` hands out a shallow
+copy: adding or replacing a column only changes the caller's frame.
+"""
+import threading
+
+import pyarrow as pa
+
+import data_cache
+import pipeline
+import schema
+
+
+# Nama view -> (view sumber, tahap pipeline)
+VIEWS = {
+    'normalized': ('loaded', pipeline.normalize),
+    'clean': ('normalized', lambda df: pipeline.add_region(pipeline.clean(df))),
+}
+
+_datasets = data_cache.VersionedCache('open_dataset')
+
+
+def to_arrow(frame):
+    """Arrow table of ``frame`` with float NaN kept as values, not nulls."""
+    table = pa.Table.from_pandas(frame)
+    for i, name in enumerate(table.column_names):
+        if name in frame.columns and frame[name].dtype.kind == 'f':
+            # NaN sebagai null memaksa to_pandas menyalin kolom
+            table = table.set_column(i, name, pa.array(frame[name].to_numpy()))
+    return table
+
+
+def to_frame(table):
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedDataset:
+    """Arrow-backed views of one workbook version, derived on first use."""
+
+    def __init__(self, version, loaded, memory):
+        self.version = version
+        self.memory = memory
+        self._tables = {'loaded': to_arrow(loaded)}
+        self._frames = {'loaded': to_frame(self._tables['loaded'])}
+        self._quality = None
+        self._lock = threading.Lock()
+
+    def view(self, name='loaded'):
+        """Frame for ``name`` ('loaded', 'normalized' or 'clean') over the shared buffers."""
+        frame = self._frames.get(name)
+        if frame is None:
+            source, stage = VIEWS[name]
+            derived = stage(self.view(source))
+            with self._lock:
+                if name not in self._frames:
+                    self._tables[name] = to_arrow(derived)
+                    self._frames[name] = to_frame(self._tables[name])
+            frame = self._frames[name]
+        # Salinan dangkal: kolom baru/diganti tidak ikut ke frame bersama
+        return frame.copy(deep=False)
+
+    def table(self, name='loaded'):
+        self.view(name)
+        return self._tables[name]
+
+    def quality_report(self):
+        if self._quality is None:
+            self._quality = pipeline.quality_report(self.view('normalized'))
+        return self._quality
+
+    def nbytes(self):
+        return sum(table.nbytes for table in self._tables.values())
+
+
+def open_dataset(path, loader=data_cache.load_gii_workbook):
+    """Dataset for the current version of ``path``, built once per process.
+
+    ``loader`` reads the source into the workbook columns, e.g.
+    ``annex.load_annex_gii`` for the raw HDR Statistical Annex.
+    """
+    version = data_cache.source_version(path)
+
+    def load():
+        raw = loader(path)
+        # Terapkan skema ringkas (kategori, int kecil, float32) saat load
+        loaded = schema.apply(raw)
+        return SharedDataset(version, loaded, schema.memory_report(raw, loaded))
+
+    # Versi lama tidak dipakai lagi oleh sesi yang rerun, jadi cukup satu
+    return _datasets.get(version, load)
@@ -0,0 +1,136 @@
+"""Batched per-country projections of the GII and its components to 2030.
+
+Every (country, indicator) series is fitted at once with a weighted linear
+least-squares trend: the normal equations reduce to a handful of masked
+sums over the year axis, so all countries and indicators are solved in one
+set of NumPy operations. Weights decay exponentially into the past and NaN
+gaps get weight zero. Series with fewer than ``MIN_OBSERVED`` points are
+carried forward flat from their last value.
+"""
+import os
+
+import numpy as np
+
+import data_cache
+
+
+INDICATORS = ['gii', 'mmr', 'abr', 'pr_f', 'pr_m', 'se_f', 'se_m', 'lfpr_f', 'lfpr_m']
+HORIZON = 2030
+WINDOW = 15          # tahun terakhir yang dipakai untuk tren
+HALF_LIFE = 5.0      # bobot tahun ke-t turun setengah tiap 5 tahun ke belakang
+MIN_OBSERVED = 3
+
+# Batas nilai yang masuk akal per indikator
+BOUNDS = {
+    'gii': (0.0, 1.0),
+    'mmr': (1.0, None),
+    'abr': (0.0, None),
+}
+PERCENT = (0.0, 100.0)
+
+_results = data_cache.VersionedCache('open_forecast')
+
+
+def fit(values, years, horizon_years):
+    """Project ``values`` (series, year) to ``horizon_years``; returns (series, horizon).
+
+    Solves the 2x2 weighted normal equations for intercept and slope of
+    every series at once.
+    """
+    years = np.asarray(years, dtype='float64')
+    values = values[:, -WINDOW:].astype('float64')
+    t = years[-WINDOW:] - years[-1]
+    observed = ~np.isnan(values)
+    w = np.where(observed, 0.5 ** (-t / HALF_LIFE), 0.0)
+    y = np.where(observed, values, 0.0)
+
+    sw = w.sum(axis=1)
+    swt = (w * t).sum(axis=1)
+    swtt = (w * t * t).sum(axis=1)
+    swy = (w * y).sum(axis=1)
+    swty = (w * t * y).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        det = sw * swtt - swt * swt
+        slope = (sw * swty - swt * swy) / det
+        intercept = (swy - slope * swt) / sw
+
+    h = np.asarray(horizon_years, dtype='float64') - years[-1]
+    projected = intercept[:, None] + slope[:, None] * h[None, :]
+
+    # Terlalu sedikit titik untuk tren: pakai nilai terakhir yang ada
+    n_observed = observed.sum(axis=1)
+    last_index = np.where(observed.any(axis=1), observed.shape[1] - 1 - observed[:, ::-1].argmax(axis=1), 0)
+    last = values[np.arange(len(values)), last_index]
+    flat = (n_observed > 0) & (n_observed < MIN_OBSERVED)
+    projected[flat] = last[flat, None]
+    projected[n_observed == 0] = np.nan
+    return projected
+
+
+def project(store, horizon=HORIZON):
+    """Return ``(years, indicators, values)`` with values shaped (country, year, indicator)."""
+    horizon_years = np.arange(int(store.years[-1]) + 1, horizon + 1, dtype='i2')
+    matrices = [store.matrix(name)[0] for name in INDICATORS]
+    n_countries = matrices[0].shape[0]
+    stacked = np.concatenate(matrices, axis=0)
+    projected = fit(stacked, store.years, horizon_years)
+    values = projected.reshape(len(INDICATORS), n_countries, len(horizon_years)).transpose(1, 2, 0)
+    for i, name in enumerate(INDICATORS):
+        low, high = BOUNDS.get(name, PERCENT)
+        values[..., i] = np.clip(values[..., i], low, high)
+    return horizon_years, list(INDICATORS), values.astype('float32')
+
+
+def matrices(result):
+    """Projection as ``{indicator: (country, year) array}`` like ``store.matrix``."""
+    _, indicators, values = result
+    return {name: values[..., i] for i, name in enumerate(indicators)}
+
+
+def country_series(store, result, indicator, countries):
+    """History and projection of ``indicator`` per selected country name."""
+    years, indicators, values = result
+    history, history_years = store.matrix(indicator)
+    names = store.country_table()['country'].tolist()
+    series = []
+    for country in countries:
+        if country not in names:
+            continue
+        row = names.index(country)
+        series.append({
+            'country': country,
+            'years': history_years,
+            'values': history[row],
+            'forecast_years': years,
+            'forecast_values': values[row, :, indicators.index(indicator)],
+        })
+    return series
+
+
+def _result_path(version):
+    return os.path.join(data_cache.CACHE_DIR, f'forecast-{version[:16]}-{HORIZON}.npz')
+
+
+def save(result, version):
+    years, indicators, values = result
+    data_cache.save_arrays(_result_path(version), years=years, indicators=np.array(indicators), values=values)
+
+
+def load(version):
+    """Saved ``(years, indicators, values)`` for ``version`` or None."""
+    saved = data_cache.load_arrays(_result_path(version))
+    if saved is None:
+        return None
+    return saved['years'], saved['indicators'].tolist(), saved['values']
+
+
+def open_forecast(store):
+    """``project(store)`` cached per data version in memory and on disk."""
+    def load_or_build():
+        result = load(store.version)
+        if result is None:
+            result = project(store)
+            save(result, store.version)
+        return result
+
+    return _results.get(store.version, load_or_build)
@@ -0,0 +1,261 @@
+"""Shared local inference process with request micro-batching.
+
+    python inference_service.py --unix /tmp/gii-inference.sock
+    python inference_service.py --port 8765
+
+The service holds the single model instance for every dashboard session.
+Requests that arrive within ``--window-ms`` of each other are scored with
+one ``model.predict`` call. The dashboard uses it when GII_INFERENCE_ADDRESS
+is set (``unix:/path`` or ``tcp:host:port``) and otherwise, or when the
+service cannot be reached, predicts the single row in-process with the
+compiled tree evaluator (compiled_model.py).
+
+Protocol: one JSON object per line, ``{"id": 1, "rows": [[...15 floats...]]}``
+answered with ``{"id": 1, "predictions": [...]}`` or ``{"id": 1, "error": "..."}``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+
+import compiled_model
+import model_registry
+
+
+ADDRESS = os.environ.get('GII_INFERENCE_ADDRESS')
+WINDOW_MS = 3.0
+MAX_BATCH_ROWS = 4096
+TIMEOUT_S = 5.0
+
+
+def rows_to_frame(rows):
+    frame = model_registry.empty_features(len(rows))
+    values = np.asarray(rows, dtype='float64').reshape(len(rows), len(model_registry.FEATURE_COLUMNS))
+    for i, column in enumerate(model_registry.FEATURE_COLUMNS):
+        if column in model_registry.REGION_FEATURES:
+            frame[column] = values[:, i] != 0
+        else:
+            frame[column] = values[:, i]
+    return frame
+
+
+def check_rows(rows):
+    """Raise ValueError unless ``rows`` is a non-empty list of numeric feature rows."""
+    n_features = len(model_registry.FEATURE_COLUMNS)
+    if not isinstance(rows, list) or not rows:
+        raise ValueError('rows harus list baris fitur yang tidak kosong')
+    for row in rows:
+        if not isinstance(row, list) or len(row) != n_features:
+            raise ValueError(f'setiap baris harus berisi {n_features} nilai')
+        if not all(isinstance(value, (int, float)) for value in row):
+            raise ValueError('nilai fitur harus numerik')
+
+
+class MicroBatcher:
+    """Collect pending requests for up to ``window`` seconds, predict once."""
+
+    def __init__(self, model, window=WINDOW_MS / 1000, max_rows=MAX_BATCH_ROWS):
+        self.model = model
+        self.window = window
+        self.max_rows = max_rows
+        self.queue = asyncio.Queue()
+        self.stats = {'requests': 0, 'batches': 0, 'rows': 0}
+
+    async def predict(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            n_rows = len(pending[0][0])
+            deadline = loop.time() + self.window
+            while n_rows < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+
+            rows = [row for request_rows, _ in pending for row in request_rows]
+            try:
+                # predict di thread lain supaya batch berikutnya tetap bisa dikumpulkan
+                predictions = await loop.run_in_executor(
+                    None, lambda: self.model.predict(rows_to_frame(rows)).tolist())
+            except Exception as exc:  # kirim error ke semua request di batch ini
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.stats['requests'] += len(pending)
+            self.stats['batches'] += 1
+            self.stats['rows'] += len(rows)
+            start = 0
+            for request_rows, future in pending:
+                # Future sudah dibatalkan bila koneksinya putus saat batch diprediksi
+                if not future.done():
+                    future.set_result(predictions[start:start + len(request_rows)])
+                start += len(request_rows)
+
+
+async def handle_connection(batcher, reader, writer):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = {'rows': None}
+            if request.get('stats'):
+                response = {'id': request.get('id'), 'stats': batcher.stats}
+            else:
+                try:
+                    # Request yang salah bentuk ditolak sendiri, tidak ikut menggagalkan batch
+                    check_rows(request.get('rows'))
+                    predictions = await batcher.predict(request['rows'])
+                    response = {'id': request.get('id'), 'predictions': predictions}
+                except Exception as exc:
+                    response = {'id': request.get('id'), 'error': str(exc)}
+            writer.write((json.dumps(response) + '\n').encode())
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(address, model_path=model_registry.MODEL_PATH, window_ms=WINDOW_MS,
+                max_rows=MAX_BATCH_ROWS):
+    entry = model_registry.get_model(model_path)
+    batcher = MicroBatcher(entry.model, window_ms / 1000, max_rows)
+    batch_task = asyncio.create_task(batcher.run())
+
+    def handler(reader, writer):
+        return handle_connection(batcher, reader, writer)
+
+    kind, _, target = address.partition(':')
+    if kind == 'unix':
+        if os.path.exists(target):
+            os.remove(target)
+        server = await asyncio.start_unix_server(handler, path=target)
+    else:
+        host, _, port = target.rpartition(':')
+        server = await asyncio.start_server(handler, host or '127.0.0.1', int(port))
+    print(f'serving model {entry.sha256[:12]} on {address} '
+          f'(window {window_ms} ms, max {max_rows} rows)', flush=True)
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+class InferenceClient:
+    """Blocking client, one persistent connection per calling thread."""
+
+    def __init__(self, address=ADDRESS, timeout=TIMEOUT_S):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = iter(range(1, 1 << 62))
+
+    def _connect(self):
+        kind, _, target = self.address.partition(':')
+        if kind == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+        else:
+            host, _, port = target.rpartition(':')
+            sock = socket.create_connection((host or '127.0.0.1', int(port)), self.timeout)
+        return sock, sock.makefile('rb')
+
+    def request(self, payload):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        sock, stream = conn
+        try:
+            sock.sendall((json.dumps(payload) + '\n').encode())
+            line = stream.readline()
+            if not line:
+                raise ConnectionError('inference service closed the connection')
+        except OSError:
+            self.close()
+            raise
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def predict(self, frame):
+        rows = frame[model_registry.FEATURE_COLUMNS].to_numpy(dtype='float64').tolist()
+        response = self.request({'id': next(self._ids), 'rows': rows})
+        return np.asarray(response['predictions'])
+
+    def stats(self):
+        return self.request({'id': next(self._ids), 'stats': True})['stats']
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+            self._local.conn = None
+
+
+_client = InferenceClient(ADDRESS) if ADDRESS else None
+
+
+def predict(frame, model_path=model_registry.MODEL_PATH):
+    """Predict through the shared service when configured, else in-process.
+
+    The in-process fallback scores single rows with the compiled evaluator,
+    which skips importing xgboost and unpickling the booster. It is also used
+    when the service answers with an error.
+    """
+    if _client is not None:
+        try:
+            return _client.predict(frame)
+        except (OSError, RuntimeError):
+            pass  # service tidak jalan atau menolak request: fallback ke model di proses ini
+    return compiled_model.open_compiled(model_path).predict(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--unix', help='Unix socket path')
+    group.add_argument('--port', type=int, help='TCP port on 127.0.0.1')
+    parser.add_argument('--model', default=model_registry.MODEL_PATH)
+    parser.add_argument('--window-ms', type=float, default=WINDOW_MS)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_ROWS)
+    args = parser.parse_args()
+
+    if args.unix:
+        address = f'unix:{args.unix}'
+    elif args.port:
+        address = f'tcp:127.0.0.1:{args.port}'
+    else:
+        address = ADDRESS or 'tcp:127.0.0.1:8765'
+    start = time.perf_counter()
+    try:
+        asyncio.run(serve(address, args.model, args.window_ms, args.max_batch))
+    except KeyboardInterrupt:
+        print(f'stopped after {time.perf_counter() - start:.0f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""Multi-session load test for the dashboard.
+
+    python loadtest.py --sessions 1 5 10 20 --steps 10
+
+Starts ``streamlit run capstone.py`` headless on a free port (or uses a
+running server with ``--port``) and opens N websocket sessions the way a
+browser tab does. Every session loads the page and then replays random
+interaction scripts (SCRIPTS): changing the correlation selectboxes, the
+year sliders, the similar-country picker, or filling in and submitting
+the predictor form. The predictor lives on its own page (PAGES), so a
+session switches pages first, which is timed as a ``navigate`` rerun.
+Each interaction is one rerun, timed from the BackMsg
+to the ``script_finished`` ForwardMsg. After each level, while its sessions
+are still connected, the server's RSS is read with ``ps``. The report lists
+p50/p95 rerun latency per level and script, and RSS growth per session.
+Results are appended to .cache/bench/loadtest.jsonl.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+import data_cache
+
+
+RESULTS_PATH = os.path.join(data_cache.CACHE_DIR, 'bench', 'loadtest.jsonl')
+SERVER_LOG = os.path.join(data_cache.CACHE_DIR, 'bench', 'loadtest-server.log')
+RERUN_TIMEOUT_S = 120.0
+STARTUP_TIMEOUT_S = 60.0
+
+# Jenis widget -> field WidgetState yang dikirim frontend
+WIDGET_VALUES = {
+    'selectbox': 'int_value',
+    'slider': 'double_array_value',
+    'multiselect': 'int_array_value',
+    'number_input': 'double_value',
+    'checkbox': 'bool_value',
+    'button': 'trigger_value',
+}
+
+PREDICT_INPUTS = {
+    'GII Value': (0.0, 0.8),
+    'Maternal Mortality Ratio': (1.0, 1000.0),
+    'Adolescent Birth Rate': (0.0, 200.0),
+    'Share of Seats in Parliament': (0.0, 60.0),
+    'Female Secondary Education': (0.0, 100.0),
+    'Male Secondary Education': (0.0, 100.0),
+    'Female Labour Force': (0.0, 90.0),
+    'Male Labour Force': (30.0, 95.0),
+}
+
+# Nama skrip -> langkah; tiap langkah = widget (key atau label) yang diubah dalam satu rerun
+SCRIPTS = {
+    'correlation': [['Select x-axis:'], ['Select y-axis:'], ['corr_year']],
+    'browse': [['hd_year'], ['region_indicator'], ['region_year'], ['map_year'], ['trend_countries']],
+    'similar': [['similar_country'], ['similar_k']],
+    'predict': [list(PREDICT_INPUTS) + ['Predict']],
+}
+
+# Skrip yang widget-nya ada di halaman lain (nama halaman di pages/); default halaman utama
+PAGES = {
+    'predict': 'Prediksi_HD',
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, script='capstone.py'):
+    """``streamlit run`` in a subprocess; returns it once /_stcore/health answers."""
+    os.makedirs(os.path.dirname(SERVER_LOG), exist_ok=True)
+    log = open(SERVER_LOG, 'w')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script, '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'streamlit exited with {process.returncode}, see {SERVER_LOG}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'streamlit did not start within {STARTUP_TIMEOUT_S:.0f}s, see {SERVER_LOG}')
+
+
+def rss_bytes(pid):
+    """Resident set size of ``pid`` via ``ps`` (Linux and macOS), None if unavailable."""
+    try:
+        out = subprocess.run(['ps', '-o', 'rss=', '-p', str(pid)], capture_output=True,
+                             text=True, check=True).stdout
+        return int(out.split()[0]) * 1024
+    except (OSError, subprocess.CalledProcessError, IndexError, ValueError):
+        return None
+
+
+class Session:
+    """One simulated browser tab speaking Streamlit's websocket protocol."""
+
+    def __init__(self, port, query_string='', rng=None):
+        self.url = f'ws://127.0.0.1:{port}/_stcore/stream'
+        self.query_string = query_string
+        self.page_name = ''
+        self.rng = rng or random.Random()
+        self.widgets = {}   # id -> (jenis, proto), urutan sesuai halaman
+        self.states = {}    # id -> WidgetState yang sudah diubah sesi ini
+        self.ws = None
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.ws = await websocket_connect(self.url, max_message_size=1 << 30)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    async def rerun(self):
+        """Send the widget states, wait for the rerun to finish; returns (seconds, exceptions)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = self.query_string
+        message.rerun_script.page_name = self.page_name
+        for state in self.states.values():
+            message.rerun_script.widget_states.widgets.add().CopyFrom(state)
+        # Trigger tombol hanya berlaku untuk satu rerun
+        self.states = {i: s for i, s in self.states.items() if s.WhichOneof('value') != 'trigger_value'}
+
+        widgets = {}
+        exceptions = []
+        start = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), RERUN_TIMEOUT_S)
+            if raw is None:
+                raise ConnectionError('server closed the session')
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type in WIDGET_VALUES:
+                    proto = getattr(element, element_type)
+                    widgets[proto.id] = (element_type, proto)
+                elif element_type == 'exception':
+                    exceptions.append(element.exception.message)
+            elif kind == 'script_finished':
+                break
+        seconds = time.perf_counter() - start
+        self.widgets = widgets
+        self.states = {i: s for i, s in self.states.items() if i in widgets}
+        return seconds, exceptions
+
+    def find(self, ref):
+        """Widget id for a user key (matched on the id suffix) or a label."""
+        for widget_id, (_, proto) in self.widgets.items():
+            if widget_id.endswith('-' + ref):
+                return widget_id
+        for widget_id, (_, proto) in self.widgets.items():
+            if proto.label == ref:
+                return widget_id
+        return None
+
+    def change(self, ref):
+        """Set a random new value for widget ``ref``; False if it is not on the page."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id = self.find(ref)
+        if widget_id is None:
+            return False
+        element_type, proto = self.widgets[widget_id]
+        state = WidgetState(id=widget_id)
+        rng = self.rng
+        if element_type == 'selectbox':
+            state.int_value = rng.randrange(max(len(proto.options), 1))
+        elif element_type == 'slider':
+            n_steps = int(round((proto.max - proto.min) / proto.step)) if proto.step else 0
+            state.double_array_value.data.append(proto.min + rng.randint(0, n_steps) * proto.step)
+        elif element_type == 'multiselect':
+            picked = rng.sample(range(len(proto.options)), min(len(proto.options), rng.randint(1, 5)))
+            state.int_array_value.data.extend(picked)
+        elif element_type == 'number_input':
+            state.double_value = round(rng.uniform(*PREDICT_INPUTS.get(proto.label, (0.0, 100.0))), 2)
+        elif element_type == 'checkbox':
+            state.bool_value = rng.random() < 0.5
+        else:
+            state.trigger_value = True
+        self.states[widget_id] = state
+        return True
+
+
+async def run_session(port, steps, think, seed, query_string, scripts, record):
+    """Load the page, then replay ``steps`` random scripts; appends timings to ``record``."""
+    rng = random.Random(seed)
+    session = Session(port, query_string, rng)
+    await session.connect()
+    try:
+        seconds, exceptions = await session.rerun()
+        record.append(('initial', seconds, exceptions))
+        for _ in range(steps):
+            name = rng.choice(scripts)
+            page_name = PAGES.get(name, '')
+            if page_name != session.page_name:
+                # Pindah halaman: widget halaman lama tidak ikut dikirim
+                session.page_name = page_name
+                session.states = {}
+                seconds, exceptions = await session.rerun()
+                record.append(('navigate', seconds, exceptions))
+            for refs in SCRIPTS[name]:
+                if not any([session.change(ref) for ref in refs]):
+                    continue  # widget tidak ada (mis. mode statis)
+                await asyncio.sleep(rng.uniform(0, think))
+                seconds, exceptions = await session.rerun()
+                record.append((name, seconds, exceptions))
+    except Exception:
+        session.close()
+        raise
+    return session
+
+
+def summarize(seconds):
+    ms = np.asarray(seconds) * 1000
+    if not len(ms):
+        return {'count': 0}
+    return {'count': int(len(ms)), 'p50_ms': float(np.percentile(ms, 50)),
+            'p95_ms': float(np.percentile(ms, 95)), 'max_ms': float(ms.max())}
+
+
+async def run_level(port, n_sessions, args, pid, baseline_rss):
+    record = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        run_session(port, args.steps, args.think, args.seed * 1000 + i, args.query, args.scripts, record)
+        for i in range(n_sessions)], return_exceptions=True)
+    wall = time.perf_counter() - start
+    # RSS diukur saat semua sesi masih terhubung
+    rss = rss_bytes(pid) if pid else None
+    for result in results:
+        if isinstance(result, Session):
+            result.close()
+
+    interactions = [seconds for name, seconds, _ in record if name != 'initial']
+    level = {
+        'sessions': n_sessions,
+        'wall_s': wall,
+        'failed_sessions': sum(isinstance(r, Exception) for r in results),
+        'exceptions': sorted({message for _, _, messages in record for message in messages}),
+        'initial': summarize([s for name, s, _ in record if name == 'initial']),
+        'reruns': summarize(interactions),
+        'scripts': {name: summarize([s for n, s, _ in record if n == name])
+                    for name in list(args.scripts) + ['navigate']},
+        'rss_bytes': rss,
+        'rss_growth_per_session': (rss - baseline_rss) / n_sessions if rss and baseline_rss else None,
+    }
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        level['first_failure'] = repr(failures[0])
+    return level
+
+
+def print_level(level):
+    mb = 1024 * 1024
+    reruns, initial = level['reruns'], level['initial']
+    rss = f"{level['rss_bytes'] / mb:8.1f}" if level['rss_bytes'] else f"{'-':>8}"
+    growth = level['rss_growth_per_session']
+    growth = f'{growth / mb:+9.2f}' if growth is not None else f"{'-':>9}"
+    print(f"{level['sessions']:>8} {reruns['count']:>7} {reruns.get('p50_ms', 0):>8.0f} "
+          f"{reruns.get('p95_ms', 0):>8.0f} {reruns.get('max_ms', 0):>8.0f} "
+          f"{initial.get('p50_ms', 0):>9.0f} {rss} {growth} {level['failed_sessions']:>6}")
+    for name, stats in level['scripts'].items():
+        if stats['count']:
+            print(f"{'':>8}   {name:14} n={stats['count']:<5} p50 {stats['p50_ms']:.0f} ms, "
+                  f"p95 {stats['p95_ms']:.0f} ms")
+    for message in level['exceptions']:
+        print(f"{'':>8}   exception: {message}")
+    if 'first_failure' in level:
+        print(f"{'':>8}   session failed: {level['first_failure']}")
+
+
+async def main_async(args):
+    server = None
+    port, pid = args.port, args.pid
+    if port is None:
+        port = free_port()
+        server = start_server(port)
+        pid = server.pid
+    try:
+        # Sesi pemanasan: cache proses (dataset, store, model) terisi sebelum baseline
+        warmup = []
+        session = await run_session(port, 0, 0, args.seed, args.query, args.scripts, warmup)
+        session.close()
+        await asyncio.sleep(1.0)
+        baseline_rss = rss_bytes(pid) if pid else None
+        rss = f'{baseline_rss / 1024 / 1024:.1f} MB' if baseline_rss else 'unavailable'
+        print(f'warm-up load {warmup[0][1] * 1000:.0f} ms, baseline RSS {rss}')
+
+        print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} "
+              f"{'load p50':>9} {'RSS MB':>8} {'MB/sess':>9} {'failed':>6}")
+        levels = []
+        for n_sessions in args.sessions:
+            level = await run_level(port, n_sessions, args, pid, baseline_rss)
+            print_level(level)
+            levels.append(level)
+            await asyncio.sleep(args.pause)
+        final_rss = rss_bytes(pid) if pid else None
+        return {'baseline_rss': baseline_rss, 'final_rss': final_rss, 'levels': levels}
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10],
+                        help='concurrent session counts, one level each')
+    parser.add_argument('--steps', type=int, default=10, help='interaction scripts per session')
+    parser.add_argument('--think', type=float, default=0.5, help='max think time between reruns (s)')
+    parser.add_argument('--scripts', nargs='+', default=list(SCRIPTS), choices=list(SCRIPTS))
+    parser.add_argument('--query', default='', help='query string, e.g. static=1')
+    parser.add_argument('--port', type=int, help='use a running server instead of starting one')
+    parser.add_argument('--pid', type=int, help='server pid for RSS when --port is given')
+    parser.add_argument('--pause', type=float, default=2.0, help='pause between levels (s)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'a') as f:
+        f.write(json.dumps({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'query': args.query,
+                            'steps': args.steps, 'think': args.think, **result}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+
+
+# Lokasi model bisa diganti lewat environment variable
+MODEL_PATH = os.environ.get('GII_MODEL_PATH', '/Users/keiziapurba/xgb_model.pkl')
+
+NUMERIC_FEATURES = [
+    'gii value',
+    'maternal mortality ratio',
+    'adolescent birth rate',
+    'share of seats in parliament',
+    'f_secondary_edu',
+    'm_secondary_edu',
+    'f_labour_force',
+    'm_labour_force',
+]
+REGION_FEATURES = [
+    'region_East Asia and the Pacific',
+    'region_Europe and Central Asia',
+    'region_Latin America and the Caribbean',
+    'region_Middle East and North Africa',
+    'region_North America',
+    'region_South Asia',
+    'region_Sub-Saharan Africa',
+]
+FEATURE_COLUMNS = NUMERIC_FEATURES + REGION_FEATURES
+PREDICTION_LABELS = ['Low', 'Medium', 'High', 'Very High']
+
+LoadedModel = namedtuple('LoadedModel', ['model', 'sha256', 'path', 'load_seconds'])
+
+_models = data_cache.VersionedCache('get_model')
+_lock = threading.Lock()
+_warm_thread = None
+
+
+def empty_features(n_rows=1):
+    """Zero feature frame with the dtypes the dashboard passes to predict()."""
+    frame = pd.DataFrame(np.zeros((n_rows, len(NUMERIC_FEATURES))), columns=NUMERIC_FEATURES)
+    for column in REGION_FEATURES:
+        frame[column] = False
+    return frame
+
+
+def get_model(path=MODEL_PATH):
+    """Return the model for ``path``, loading and warming it once per process.
+
+    Models are keyed on the sha256 of the artifact, so replacing the file
+    loads the new model while identical copies share one instance.
+    """
+    sha256 = data_cache.source_version(path)
+
+    def load():
+        start = time.perf_counter()
+        # joblib/xgboost baru di-import saat model benar-benar dibutuhkan
+        import joblib
+        model = joblib.load(path)
+        # Dummy predict supaya inisialisasi booster tidak dibayar user pertama
+        model.predict(empty_features())
+        return LoadedModel(model, sha256, path, time.perf_counter() - start)
+
+    return _models.get(sha256, load)
+
+
+def warm_in_background(path=MODEL_PATH, loader=get_model):
+    """Start ``loader(path)`` in a daemon thread (once per process)."""
+    global _warm_thread
+    with _lock:
+        if _warm_thread is not None or not os.path.exists(path):
+            return
+        _warm_thread = threading.Thread(target=loader, args=(path,),
+                                        name='model-warmup', daemon=True)
+        _warm_thread.start()
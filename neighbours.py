@@ -0,0 +1,105 @@
+"""Nearest-neighbour index over standardized country-year feature vectors.
+
+Every country-year with all eight prediction features observed becomes a
+point in a KD-tree (scipy's cKDTree; a NumPy brute-force search is used
+when scipy is not installed). Each feature is standardized with its mean
+and standard deviation over all indexed country-years, so no single unit
+(deaths per 100,000 vs. shares in %) dominates the distance. The index is
+built once per time-series version.
+"""
+import numpy as np
+import pandas as pd
+
+import data_cache
+import model_registry
+from batch_predict import build_features
+
+
+K = 5
+
+_indexes = data_cache.VersionedCache('open_index')
+
+
+class _BruteForce:
+    """Same ``query`` interface as cKDTree for the few thousand points indexed here."""
+
+    def __init__(self, points):
+        self.data = points
+
+    def query(self, x, k):
+        distance = np.sqrt(((self.data - x) ** 2).sum(axis=1))
+        k = min(k, len(distance))
+        order = np.argpartition(distance, k - 1)[:k]
+        order = order[np.argsort(distance[order])]
+        return distance[order], order
+
+
+class NeighbourIndex:
+    def __init__(self, features):
+        values = features[model_registry.NUMERIC_FEATURES].to_numpy(dtype='float64')
+        complete = ~np.isnan(values).any(axis=1)
+        self.values = values[complete]
+        self.columns = {name: features[name].to_numpy()[complete] for name in ('iso3', 'country', 'region', 'year')}
+        self.mean = self.values.mean(axis=0)
+        self.std = self.values.std(axis=0)
+        points = (self.values - self.mean) / self.std
+        # scipy baru di-import saat index dibangun, bukan saat modul di-import
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:  # scipy opsional: fallback ke brute force
+            cKDTree = None
+        self.tree = cKDTree(points) if cKDTree is not None else _BruteForce(points)
+        self._position = {(c, int(y)): i for i, (c, y) in enumerate(zip(self.columns['country'], self.columns['year']))}
+
+    def __len__(self):
+        return len(self.values)
+
+    def query(self, inputs, k=K, exclude_country=None, distinct=True):
+        """k nearest country-years to ``inputs`` (mapping of the eight numeric features).
+
+        With ``distinct`` each country appears once, at its closest year.
+        Returns a frame with iso3, country, region, year, distance and the
+        raw feature values.
+        """
+        x = (np.array([inputs[f] for f in model_registry.NUMERIC_FEATURES], dtype='float64') - self.mean) / self.std
+        # Kandidat diperbanyak dua kali lipat sampai tersisa k baris setelah disaring
+        n = min(2 * k, len(self))
+        while True:
+            distance, index = self.tree.query(x, k=n)
+            distance, index = np.atleast_1d(distance), np.atleast_1d(index)
+            country = self.columns['country'][index]
+            keep = np.ones(len(index), dtype=bool)
+            if exclude_country is not None:
+                keep &= country != exclude_country
+            if distinct:
+                first = np.zeros(len(index), dtype=bool)
+                first[np.unique(country, return_index=True)[1]] = True
+                keep &= first
+            if keep.sum() >= k or n == len(self):
+                break
+            n = min(2 * n, len(self))
+        index, distance = index[keep][:k], distance[keep][:k]
+
+        result = {name: column[index] for name, column in self.columns.items()}
+        result['distance'] = distance
+        for i, feature in enumerate(model_registry.NUMERIC_FEATURES):
+            result[feature] = self.values[index, i]
+        return pd.DataFrame(result)
+
+    def similar_to(self, country, year=None, k=K, exclude_country=True, distinct=True):
+        """k country-years most similar to ``country`` in ``year`` (default: its latest indexed year)."""
+        if year is None:
+            years = self.columns['year'][self.columns['country'] == country]
+            if not len(years):
+                raise KeyError(f'{country} tidak punya tahun dengan data lengkap')
+            year = int(years.max())
+        position = self._position.get((country, int(year)))
+        if position is None:
+            raise KeyError(f'{country} {year} tidak punya data lengkap untuk 8 fitur')
+        inputs = dict(zip(model_registry.NUMERIC_FEATURES, self.values[position]))
+        return self.query(inputs, k, exclude_country=country if exclude_country else None, distinct=distinct)
+
+
+def open_index(store):
+    """Index for the store's version, built once per process."""
+    return _indexes.get(store.version, lambda: NeighbourIndex(build_features(store)))
@@ -0,0 +1,99 @@
+"""Predictor page: the HD-category form of the dashboard on its own page.
+
+Streamlit 1.22 has no fragments, so on the main page every Predict submit
+reran the whole dashboard script. On this page a submit reruns only the form,
+the prediction and the similar country-years.
+"""
+import pandas as pd
+import streamlit as st
+
+import data_cache
+import inference_service
+import model_registry
+import neighbours
+import perf
+import timeseries
+
+
+st.set_page_config(
+    page_title='Human Development Category Prediction',
+    layout='wide',
+    initial_sidebar_state='collapsed'
+)
+
+perf.start_rerun()
+perf.mark('predictor')
+
+st.title('Human Development Category Prediction')
+
+# Get prediction label
+prediction_labels = model_registry.PREDICTION_LABELS
+
+# Input form: semua input dikirim sekaligus dengan satu tombol submit
+with st.form('prediction_form'):
+    st.subheader('Input Features')
+    gii_value = st.number_input('GII Value')
+    maternal_mortality_ratio = st.number_input('Maternal Mortality Ratio')
+    adolescent_birth_rate = st.number_input('Adolescent Birth Rate')
+    share_of_seats_in_parliament = st.number_input('Share of Seats in Parliament')
+    f_secondary_edu = st.number_input('Female Secondary Education')
+    m_secondary_edu = st.number_input('Male Secondary Education')
+    f_labour_force = st.number_input('Female Labour Force')
+    m_labour_force = st.number_input('Male Labour Force')
+    region_east_asia_pacific = st.checkbox('Region: East Asia and the Pacific')
+    region_europe_central_asia = st.checkbox('Region: Europe and Central Asia')
+    region_latin_america_caribbean = st.checkbox('Region: Latin America and the Caribbean')
+    region_middle_east_north_africa = st.checkbox('Region: Middle East and North Africa')
+    region_north_america = st.checkbox('Region: North America')
+    region_south_asia = st.checkbox('Region: South Asia')
+    region_sub_saharan_africa = st.checkbox('Region: Sub-Saharan Africa')
+    submitted = st.form_submit_button('Predict')
+
+# Model baru dimuat saat form dikirim; hasil terakhir disimpan di session
+if submitted:
+    # Prepare input data
+    input_data = {
+        'gii value': gii_value,
+        'maternal mortality ratio': maternal_mortality_ratio,
+        'adolescent birth rate': adolescent_birth_rate,
+        'share of seats in parliament': share_of_seats_in_parliament,
+        'f_secondary_edu': f_secondary_edu,
+        'm_secondary_edu': m_secondary_edu,
+        'f_labour_force': f_labour_force,
+        'm_labour_force': m_labour_force,
+        'region_East Asia and the Pacific': region_east_asia_pacific,
+        'region_Europe and Central Asia': region_europe_central_asia,
+        'region_Latin America and the Caribbean': region_latin_america_caribbean,
+        'region_Middle East and North Africa': region_middle_east_north_africa,
+        'region_North America': region_north_america,
+        'region_South Asia': region_south_asia,
+        'region_Sub-Saharan Africa': region_sub_saharan_africa
+    }
+
+    # Create DataFrame from input data
+    input_df = pd.DataFrame(input_data, index=[0])
+
+    # Make prediction: lewat inference_service bila GII_INFERENCE_ADDRESS di-set,
+    # selain itu pohon model (compiled_model.py) dimuat sekali per proses
+    prediction = inference_service.predict(input_df)
+    prediction_label = prediction_labels[prediction[0]]
+    st.session_state['prediction_label'] = prediction_label
+
+    # Display the prediction
+    st.subheader('Prediction')
+    st.write('Human Development category:', prediction_label)
+
+    # Negara-tahun dengan profil paling mirip dengan input
+    st.write('Negara-tahun paling mirip dengan input:')
+    similar = neighbours.open_index(timeseries.open_store(data_cache.TIME_SERIES_PATH)).query(input_data)
+    st.dataframe(similar.round(3), use_container_width=True)
+else:
+    st.subheader('Prediction')
+    if 'prediction_label' in st.session_state:
+        st.write('Human Development category:', st.session_state['prediction_label'])
+    else:
+        st.write('Isi input di atas lalu tekan **Predict**.')
+
+st.write("Prediksi diatas menggunakan model machine learning dengan algoritma XGBoost dengan skor precision pada test data sebesar 76% dan pada train data sebesar 95%. Model ini memiliki skor terbaik ketimbang model lainnya (Random Forest, KNN, dan Decision Tree).")
+
+perf.finish_rerun()
@@ -0,0 +1,203 @@
+"""Per-rerun timing, cache hit/miss counting and on-demand profiling.
+
+capstone.py calls ``start_rerun()`` at the top of the script, ``mark(name)``
+at the start of every dashboard section and ``finish_rerun()`` at the end.
+Each finished rerun is appended as one JSON line to ``LOG_PATH``. The log
+is rotated to ``LOG_PATH + '.1'`` once it passes ``LOG_MAX_BYTES``, and the
+debug panel only reads its tail.
+"""
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import streamlit as st
+
+import data_cache
+
+
+LOG_PATH = os.path.join(data_cache.CACHE_DIR, 'perf', 'reruns.jsonl')
+PROFILE_DIR = os.path.join(data_cache.CACHE_DIR, 'perf', 'profiles')
+LOG_MAX_BYTES = 4 << 20
+TAIL_BLOCK = 64 << 10
+
+# Streamlit menjalankan script tiap session di thread sendiri
+_state = threading.local()
+_log_lock = threading.Lock()
+
+
+def _current():
+    return getattr(_state, 'rerun', None)
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx is not None else None
+    except ImportError:
+        return None
+
+
+def start_rerun(profile=False):
+    rerun = {
+        'started': time.time(),
+        'start': time.perf_counter(),
+        'sections': {},
+        'open': None,
+        'cache': defaultdict(lambda: {'calls': 0, 'misses': 0}),
+        'profiler': None,
+    }
+    if profile:
+        rerun['profiler'] = cProfile.Profile()
+        rerun['profiler'].enable()
+    _state.rerun = rerun
+
+
+def _close_open_section(rerun, now):
+    if rerun['open'] is not None:
+        name, start = rerun['open']
+        rerun['sections'][name] = rerun['sections'].get(name, 0.0) + now - start
+        rerun['open'] = None
+
+
+def mark(name):
+    """End the running section (if any) and start timing ``name``."""
+    rerun = _current()
+    if rerun is None:
+        return
+    now = time.perf_counter()
+    _close_open_section(rerun, now)
+    rerun['open'] = (name, now)
+
+
+def _count(name, field):
+    rerun = _current()
+    if rerun is not None:
+        rerun['cache'][name][field] += 1
+
+
+def _count_lookup(name, hit):
+    # Cache per proses (data_cache.VersionedCache) dihitung di rerun yang memanggilnya
+    _count(name, 'calls')
+    if not hit:
+        _count(name, 'misses')
+
+
+data_cache.on_cache_lookup(_count_lookup)
+
+
+def cached(func, cache=st.cache_data):
+    """``st.cache_data`` that also counts calls and misses for the rerun log."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def compute(*args, **kwargs):
+        # Hanya dijalankan saat cache miss
+        _count(name, 'misses')
+        return func(*args, **kwargs)
+
+    cached_func = cache(compute)
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        _count(name, 'calls')
+        return cached_func(*args, **kwargs)
+
+    call.clear = cached_func.clear
+    return call
+
+
+def shared(func):
+    """Like ``cached`` but with ``st.cache_resource``: every session gets the
+    same object instead of an unpickled copy, so callers must not mutate it."""
+    return cached(func, st.cache_resource)
+
+
+def finish_rerun():
+    """Write the rerun record (and profile dump, if requested); return it."""
+    rerun = _current()
+    if rerun is None:
+        return None
+    _state.rerun = None
+    now = time.perf_counter()
+    _close_open_section(rerun, now)
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(rerun['started'])),
+        'session': _session_id(),
+        'total_s': now - rerun['start'],
+        'sections': rerun['sections'],
+        'cache': {
+            name: {'hits': counts['calls'] - counts['misses'], 'misses': counts['misses']}
+            for name, counts in rerun['cache'].items()
+        },
+    }
+    if rerun['profiler'] is not None:
+        rerun['profiler'].disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        # Buka dengan snakeviz / flameprof / python -m pstats
+        path = os.path.join(PROFILE_DIR, f"rerun-{record['timestamp'].replace(':', '')}.prof")
+        rerun['profiler'].dump_stats(path)
+        record['profile'] = path
+
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    with _log_lock:
+        # Satu file cadangan: ukuran log dibatasi sekitar 2 x LOG_MAX_BYTES
+        if os.path.exists(LOG_PATH) and os.path.getsize(LOG_PATH) > LOG_MAX_BYTES:
+            os.replace(LOG_PATH, LOG_PATH + '.1')
+        with open(LOG_PATH, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
+
+
+def _tail(path, n):
+    """Last ``n`` lines of ``path``, reading backwards in TAIL_BLOCK chunks."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b''
+        while end > 0 and data.count(b'\n') <= n:
+            start = max(0, end - TAIL_BLOCK)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    return data.decode().splitlines()[-n:]
+
+
+def last_reruns(n=20):
+    lines = []
+    # Tepat setelah rotasi, sisa baris diambil dari file cadangan
+    for path in (LOG_PATH, LOG_PATH + '.1'):
+        if len(lines) < n and os.path.exists(path):
+            lines = _tail(path, n - len(lines)) + lines
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def debug_panel(n=20):
+    """Sidebar table of the last ``n`` reruns (section timings in ms)."""
+    import pandas as pd
+
+    reruns = last_reruns(n)
+    with st.sidebar.expander(f'Debug: last {len(reruns)} reruns', expanded=True):
+        if not reruns:
+            st.write('Belum ada data rerun.')
+            return
+        rows = []
+        for record in reruns:
+            row = {'timestamp': record['timestamp'], 'total': 1000 * record['total_s']}
+            row.update({name: 1000 * seconds for name, seconds in record['sections'].items()})
+            rows.append(row)
+        st.dataframe(pd.DataFrame(rows).round(1))
+
+        cache = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        for record in reruns:
+            for name, counts in record['cache'].items():
+                cache[name]['hits'] += counts['hits']
+                cache[name]['misses'] += counts['misses']
+        st.write('Cache hits/misses:')
+        st.dataframe(pd.DataFrame(cache).T)
+        if reruns[-1].get('profile'):
+            st.write('Profile:', reruns[-1]['profile'])
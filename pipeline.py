@@ -0,0 +1,59 @@
+from regions import country_to_region
+
+
+# Tahapan pengolahan data dashboard. Setiap tahap menerima DataFrame dan
+# mengembalikan objek baru (tidak mengubah input), sehingga hasilnya bisa
+# disimpan sekali per versi data sebagai view di dataset.SharedDataset.
+# hd_counts/gii_by_region hanya dipakai benchmark.py sebagai pembanding;
+# dashboard mengambil irisan cube (cube_hd_counts/cube_by_region).
+
+
+def normalize(df):
+    # Ubah kolom menjadi huruf kecil
+    return df.rename(columns=str.lower)
+
+
+def quality_report(df):
+    return {
+        # Check apakah ada data duplikat
+        'duplicated': df.duplicated().any(),
+        # Identifikasi kolom dengan nilai NaN
+        'kolom_nan': df.columns[df.isnull().any()],
+        # Evaluasi tingkat missing values dalam setiap kolom
+        'missing_values': df.isnull().sum(),
+    }
+
+
+def clean(df):
+    # Remove NaN values, lalu perbaiki tipe data
+    df_clean = df.dropna()
+    return df_clean.astype({'gii rank': 'int16', 'maternal mortality ratio': 'int16'})
+
+
+def add_region(df):
+    return df.assign(region=df['country'].map(country_to_region).astype('category'))
+
+
+def hd_counts(df):
+    dv1 = df.groupby(['human development'], observed=True)['hdi rank'].count().to_frame().rename(columns={'hdi rank': 'count'}).reset_index()
+    # Plotly ikut membaca kategori yang tidak terpakai, jadi kembalikan ke teks biasa
+    return dv1.astype({'human development': str})
+
+
+def gii_by_region(df):
+    dv2 = df.groupby(['region'], observed=True)['gii value'].mean().to_frame().reset_index()
+    dv2 = dv2.astype({'region': str})
+    dv2['color'] = ['blue' if r == 'Sub-Saharan Africa' else 'gray' for r in dv2['region']]
+    return dv2
+
+
+def cube_hd_counts(aggregates, year):
+    # Sama bentuknya dengan hd_counts, tapi diambil dari cube (lihat cube.py)
+    dv1 = aggregates.by_hd(year).rename_axis('human development').reset_index()
+    return dv1[dv1['human development'] != 'Other']
+
+
+def cube_by_region(aggregates, year, indicator='gii', label='gii value'):
+    dv2 = aggregates.by_region(year, indicator).rename(label).rename_axis('region').reset_index().dropna()
+    dv2['color'] = ['blue' if r == 'Sub-Saharan Africa' else 'gray' for r in dv2['region']]
+    return dv2
@@ -0,0 +1,137 @@
+"""Pre-render the data-only dashboard figures for the current data version.
+
+    python prerender.py [--offline]
+
+Writes standalone HTML for the HD bar chart, the region pies, the choropleth,
+the trend charts and the correlation heatmap to
+.cache/static/<time-series version>/ together with a manifest.json. Year
+selection is a Plotly slider inside each figure. With ``GII_STATIC=1`` (or
+``?static=1``) the dashboard embeds these files instead of building the
+figures, only the correlation explorer, the what-if simulation and the
+predictor stay dynamic. ``--offline`` inlines plotly.js instead of loading
+it from the CDN.
+"""
+import argparse
+import json
+import os
+import time
+
+import data_cache
+
+
+STATIC_DIR = os.path.join(data_cache.CACHE_DIR, 'static')
+# Ruang tambahan untuk slider tahun di bawah figure
+SLIDER_HEIGHT = 120
+
+_artifacts = data_cache.VersionedCache('open_artifacts')
+
+
+def static_dir(version):
+    return os.path.join(STATIC_DIR, version[:16])
+
+
+def figures(store):
+    """Artifact name -> plotly figure for every data-only chart."""
+    import plotly.graph_objects as go
+
+    import charts
+    import correlation
+    import cube
+    import pipeline
+    import trends
+
+    aggregates = cube.open_cube(store)
+    years = aggregates.years
+    out = {'hd_bar': charts.year_slider(
+        [charts.hd_bar(pipeline.cube_hd_counts(aggregates, year)) for year in years], years)}
+    for label, indicator in cube.REGION_INDICATORS.items():
+        out[f'region_pie-{indicator}'] = charts.year_slider(
+            [charts.region_pie(pipeline.cube_by_region(aggregates, year, indicator, label), label, label)
+             for year in years], years)
+
+    map_json, map_years, map_colors = charts.gii_map(store)
+    out['gii_map'] = charts.year_slider(
+        [go.Figure(charts.with_year(map_json, map_years, map_colors, year)) for year in map_years], map_years)
+
+    for pair, (female, _) in trends.PAIRS.items():
+        out[f'trend-{female[:-2]}'] = charts.trend_lines(
+            trends.country_traces(store, pair, trends.DEFAULT_COUNTRIES), pair)
+
+    corr_years, corr_features, corr_by_year = correlation.open_correlations(store)
+    out['correlation_heatmap'] = charts.year_slider(
+        [charts.correlation_heatmap(corr_features, matrix) for matrix in corr_by_year], corr_years)
+    return out
+
+
+def build(path=data_cache.TIME_SERIES_PATH, include_plotlyjs='cdn'):
+    """Write every artifact plus manifest.json; returns the output directory."""
+    import timeseries
+
+    store = timeseries.open_store(path)
+    out_dir = static_dir(store.version)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {'version': store.version, 'built': time.strftime('%Y-%m-%dT%H:%M:%S'), 'artifacts': {}}
+    for name, fig in figures(store).items():
+        file_name = f'{name}.html'
+        with data_cache.atomic_write(os.path.join(out_dir, file_name), 'w') as f:
+            fig.write_html(f, include_plotlyjs=include_plotlyjs, full_html=True, auto_play=False)
+        height = fig.layout.height or 450
+        if fig.layout.sliders:
+            height += SLIDER_HEIGHT
+        manifest['artifacts'][name] = {'file': file_name, 'height': height}
+
+    with data_cache.atomic_write(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+class StaticArtifacts:
+    """Pre-rendered HTML of one data version, read from disk once."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+        self._html = {}
+
+    def __contains__(self, name):
+        return name in self.manifest['artifacts']
+
+    def height(self, name):
+        return self.manifest['artifacts'][name]['height']
+
+    def html(self, name):
+        if name not in self._html:
+            with open(os.path.join(self.directory, self.manifest['artifacts'][name]['file'])) as f:
+                self._html[name] = f.read()
+        return self._html[name]
+
+
+def open_artifacts(version):
+    """Artifacts for ``version``, or None when ``prerender.py`` has not run for it."""
+    def read_manifest():
+        manifest_path = os.path.join(static_dir(version), 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            return StaticArtifacts(static_dir(version), json.load(f))
+
+    return _artifacts.get(version, read_manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--offline', action='store_true', help='inline plotly.js into every file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    out_dir = build(include_plotlyjs=True if args.offline else 'cdn')
+    with open(os.path.join(out_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    for name, entry in manifest['artifacts'].items():
+        size = os.path.getsize(os.path.join(out_dir, entry['file']))
+        print(f'{name:45} {size / 1024:9.1f} KB')
+    print(f'{len(manifest["artifacts"])} artifacts in {out_dir} ({time.perf_counter() - start:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""Incremental refresh for a new or corrected HDR time-series release.
+
+    python refresh.py NEW_RELEASE.csv [--install PATH]
+
+Every country-year row of the store is fingerprinted. The new release is
+diffed against the last ingested version (.cache/refresh/current.json),
+and only the affected years of the aggregate cube and the yearly
+correlations, the GII of the changed country-years and the batch
+predictions of the changed rows are recomputed. The results are saved
+under the new version, so the dashboard picks them up without starting
+from scratch. A change report listing the countries and indicators that
+moved is written to .cache/refresh/ and printed. ``--install`` copies the
+release over the dashboard's time-series file afterwards.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+import batch_predict
+import correlation
+import cube
+import data_cache
+import gii
+import model_registry
+import timeseries
+
+
+REFRESH_DIR = os.path.join(data_cache.CACHE_DIR, 'refresh')
+CURRENT_PATH = os.path.join(REFRESH_DIR, 'current.json')
+
+
+def series_names(store):
+    """Indicator names per stored (indicator, sex) block, e.g. 'lfpr_f' or 'hdi'."""
+    names = []
+    for key in sorted(store.meta['blocks']):
+        indicator, sex = key.split('|')
+        names.append(indicator if sex == 'total' else f'{indicator}_{sex}')
+    return names
+
+
+def fingerprint(values):
+    """8-byte blake2b digest per (country, year) row of a (country, year, series) array."""
+    rows = np.ascontiguousarray(values).reshape(-1, values.shape[-1])
+    digests = [hashlib.blake2b(row.tobytes(), digest_size=8).digest() for row in rows]
+    return np.array(digests, dtype='S8').reshape(values.shape[:2])
+
+
+def snapshot(store):
+    """Dense values and row fingerprints of every country-year in ``store``."""
+    names = series_names(store)
+    values = np.stack([store.matrix(name)[0] for name in names], axis=-1)
+    return {
+        'version': store.version,
+        'iso3': store.country_table()['iso3'].to_numpy(dtype='U3'),
+        'country': store.country_table()['country'].to_numpy(dtype='U64'),
+        'years': store.years,
+        'series': np.array(names),
+        'values': values,
+        'fingerprints': fingerprint(values),
+    }
+
+
+def _snapshot_path(version):
+    return os.path.join(REFRESH_DIR, f'snapshot-{version[:16]}.npz')
+
+
+def save_snapshot(snap):
+    data_cache.save_arrays(_snapshot_path(snap['version']), **snap)
+
+
+def load_snapshot(version):
+    snap = data_cache.load_arrays(_snapshot_path(version))
+    if snap is None:
+        return None
+    snap['version'] = str(snap['version'])
+    return snap
+
+
+def _align(snap, iso3, years, series):
+    """Values of ``snap`` on the given axes, NaN where ``snap`` has no entry."""
+    out = np.full((len(iso3), len(years), len(series)), np.nan, dtype='float32')
+    rows = {code: i for i, code in enumerate(snap['iso3'])}
+    cols = {int(year): i for i, year in enumerate(snap['years'])}
+    names = {name: i for i, name in enumerate(snap['series'])}
+    r = np.array([rows.get(code, -1) for code in iso3])
+    c = np.array([cols.get(int(year), -1) for year in years])
+    k = np.array([names.get(name, -1) for name in series])
+    sub = snap['values'][np.ix_(np.maximum(r, 0), np.maximum(c, 0), np.maximum(k, 0))]
+    present = (r >= 0)[:, None, None] & (c >= 0)[None, :, None] & (k >= 0)[None, None, :]
+    out[present] = sub[present]
+    return out
+
+
+def diff(old, new):
+    """Changed country-years between two snapshots of the new release's axes."""
+    same_axes = (np.array_equal(old['iso3'], new['iso3']) and np.array_equal(old['years'], new['years'])
+                 and np.array_equal(old['series'], new['series']))
+    if same_axes:
+        # Jalur cepat: bandingkan fingerprint, detail hanya untuk baris yang berubah
+        old_values = old['values']
+        changed_rows = old['fingerprints'] != new['fingerprints']
+    else:
+        old_values = _align(old, new['iso3'], new['years'], new['series'])
+        changed_rows = fingerprint(old_values) != new['fingerprints']
+
+    country_index, year_index = np.nonzero(changed_rows)
+    before = old_values[country_index, year_index]
+    after = new['values'][country_index, year_index]
+    moved = ~((before == after) | (np.isnan(before) & np.isnan(after)))
+    return {
+        'country_index': country_index,
+        'year_index': year_index,
+        'moved': moved,
+        'before': before,
+        'after': after,
+        'added_countries': sorted(set(new['iso3']) - set(old['iso3'])),
+        'removed_countries': sorted(set(old['iso3']) - set(new['iso3'])),
+        'added_years': sorted(set(new['years'].tolist()) - set(old['years'].tolist())),
+        'added_series': sorted(set(new['series']) - set(old['series'])),
+    }
+
+
+def change_report(old, new, changes, gii_changes, timings):
+    series = new['series']
+    countries = {}
+    indicators = {}
+    for i, (c, y) in enumerate(zip(changes['country_index'], changes['year_index'])):
+        entry = countries.setdefault(str(new['iso3'][c]), {
+            'country': str(new['country'][c]), 'years': set(), 'indicators': set()})
+        entry['years'].add(int(new['years'][y]))
+        for k in np.flatnonzero(changes['moved'][i]):
+            entry['indicators'].add(str(series[k]))
+            indicators[str(series[k])] = indicators.get(str(series[k]), 0) + 1
+    for entry in countries.values():
+        entry['years'] = sorted(entry['years'])
+        entry['indicators'] = sorted(entry['indicators'])
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'previous_version': old['version'],
+        'version': new['version'],
+        'changed_country_years': int(len(changes['country_index'])),
+        'countries': countries,
+        'indicators': dict(sorted(indicators.items(), key=lambda item: -item[1])),
+        'added_countries': changes['added_countries'],
+        'removed_countries': changes['removed_countries'],
+        'added_years': changes['added_years'],
+        'added_series': changes['added_series'],
+        'gii': gii_changes,
+        'timings': timings,
+    }
+
+
+def recompute_gii(old_store, store, changes, iso3, years):
+    """Recomputed GII before/after for the changed country-years only."""
+    if not len(changes['country_index']):
+        return []
+    rows, cols = changes['country_index'], changes['year_index']
+    after = gii.compute(**{k: v[rows, cols] for k, v in gii.components(store).items()})
+
+    before = np.full(len(rows), np.nan)
+    if old_store is not None:
+        old_rows = {code: i for i, code in enumerate(old_store.country_table()['iso3'])}
+        old_cols = {int(year): i for i, year in enumerate(old_store.years)}
+        r = np.array([old_rows.get(iso3[c], -1) for c in rows])
+        c = np.array([old_cols.get(int(years[y]), -1) for y in cols])
+        known = (r >= 0) & (c >= 0)
+        parts = gii.components(old_store)
+        before[known] = gii.compute(**{k: v[r[known], c[known]] for k, v in parts.items()})
+
+    moved = ~((np.abs(before - after) < 1e-9) | (np.isnan(before) & np.isnan(after)))
+    return [
+        {'iso3': str(iso3[r]), 'year': int(years[c]),
+         'before': None if np.isnan(b) else round(float(b), 4),
+         'after': None if np.isnan(a) else round(float(a), 4)}
+        for r, c, b, a in zip(rows[moved], cols[moved], before[moved], after[moved])
+    ]
+
+
+def _old_store(version):
+    npy_path, meta_path = timeseries._store_paths(version)
+    if os.path.exists(npy_path) and os.path.exists(meta_path):
+        return timeseries.TimeSeriesStore(npy_path, meta_path)
+    return None
+
+
+def ingest(path, model_path=model_registry.MODEL_PATH):
+    """Ingest the release at ``path``; returns the change report.
+
+    The release is diffed against the last ingested version. On the first
+    refresh that is the time series the dashboard reads
+    (``data_cache.TIME_SERIES_PATH``), so its saved cube, correlations and
+    predictions are reused. Returns None when there is nothing to compare
+    with or the release is unchanged.
+    """
+    timings = {}
+    start = time.perf_counter()
+    store = timeseries.open_store(path)
+    new = snapshot(store)
+    save_snapshot(new)
+    timings['snapshot_s'] = time.perf_counter() - start
+
+    previous_version = None
+    if os.path.exists(CURRENT_PATH):
+        with open(CURRENT_PATH) as f:
+            previous_version = json.load(f)['version']
+    elif os.path.exists(data_cache.TIME_SERIES_PATH):
+        # Refresh pertama: versi sebelumnya adalah data yang sedang dipakai dashboard
+        baseline = snapshot(timeseries.open_store(data_cache.TIME_SERIES_PATH))
+        save_snapshot(baseline)
+        previous_version = baseline['version']
+    old = load_snapshot(previous_version) if previous_version else None
+
+    report = None
+    if old is not None and old['version'] != new['version']:
+        start = time.perf_counter()
+        changes = diff(old, new)
+        timings['diff_s'] = time.perf_counter() - start
+        changed_years = sorted({int(new['years'][y]) for y in changes['year_index']})
+        if changes['removed_countries']:
+            # Negara yang hilang ikut menggeser agregat di semua tahunnya
+            changed_years = new['years'].tolist()
+
+        start = time.perf_counter()
+        previous_cube = cube.load(old['version'])
+        aggregates = cube.update(previous_cube, store, changed_years) if previous_cube else cube.build(store)
+        cube.save(aggregates, store.version)
+        timings['cube_s'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        previous_corr = correlation.load(old['version'])
+        corr = (correlation.update_correlations(previous_corr, store, changed_years)
+                if previous_corr else correlation.yearly_correlations(store))
+        correlation.save(corr, store.version)
+        timings['correlation_s'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        gii_changes = recompute_gii(_old_store(old['version']), store, changes, new['iso3'], new['years'])
+        timings['gii_s'] = time.perf_counter() - start
+
+        if os.path.exists(model_path):
+            start = time.perf_counter()
+            model_sha = data_cache.source_version(model_path)
+            previous_batch = batch_predict.load(old['version'], model_sha)
+            if previous_batch is not None:
+                changed = {(str(new['iso3'][c]), int(new['years'][y]))
+                           for c, y in zip(changes['country_index'], changes['year_index'])}
+                batch, scored = batch_predict.update_predictions(previous_batch, store, changed, model_path)
+                batch_predict.save(batch, store.version, model_sha)
+                timings['rows_scored'] = scored
+            timings['batch_predictions_s'] = time.perf_counter() - start
+
+        report = change_report(old, new, changes, gii_changes, timings)
+        report_path = os.path.join(REFRESH_DIR, f'report-{old["version"][:16]}-{new["version"][:16]}.json')
+        with data_cache.atomic_write(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    with data_cache.atomic_write(CURRENT_PATH, 'w') as f:
+        json.dump({'version': new['version'], 'path': os.path.abspath(path)}, f)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='new HDR time-series CSV')
+    parser.add_argument('--install', help='copy the release here after ingesting (dashboard path)')
+    parser.add_argument('--model', default=model_registry.MODEL_PATH)
+    args = parser.parse_args()
+
+    report = ingest(args.path, args.model)
+    if report is None:
+        print('snapshot saved; no previous version to compare with, or the release is unchanged')
+    else:
+        print(f"{report['changed_country_years']} country-years changed "
+              f"in {len(report['countries'])} countries")
+        for iso3, entry in sorted(report['countries'].items()):
+            print(f"  {iso3} {entry['country']:30} {', '.join(entry['indicators'])} "
+                  f"({entry['years'][0]}-{entry['years'][-1]})")
+        for name in ('added_countries', 'removed_countries', 'added_years', 'added_series'):
+            if report[name]:
+                print(f"{name.replace('_', ' ')}: {report[name]}")
+        print(f"GII recomputed for {len(report['gii'])} country-years that moved")
+        print('timings:', {k: round(v, 3) for k, v in report['timings'].items()})
+
+    if args.install:
+        with open(args.path, 'rb') as source, data_cache.atomic_write(args.install) as f:
+            shutil.copyfileobj(source, f)
+        print(f'installed as {args.install}')
+
+
+if __name__ == '__main__':
+    main()
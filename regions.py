@@ -0,0 +1,219 @@
+# Pemetaan negara ke region yang dipakai dashboard dan fitur one-hot model
+country_to_region = {
+    'Switzerland': 'Europe and Central Asia',
+    'Norway': 'Europe and Central Asia',
+    'Iceland': 'Europe and Central Asia',
+    'Hong Kong, China (SAR)': 'East Asia and the Pacific',
+    'Australia': 'East Asia and the Pacific',
+    'Denmark': 'Europe and Central Asia',
+    'Sweden': 'Europe and Central Asia',
+    'Ireland': 'Europe and Central Asia',
+    'Germany': 'Europe and Central Asia',
+    'Netherlands': 'Europe and Central Asia',
+    'Finland': 'Europe and Central Asia',
+    'Singapore': 'East Asia and the Pacific',
+    'Belgium': 'Europe and Central Asia',
+    'New Zealand': 'East Asia and the Pacific',
+    'Canada': 'North America',
+    'Liechtenstein': 'Europe and Central Asia',
+    'Luxembourg': 'Europe and Central Asia',
+    'United Kingdom': 'Europe and Central Asia',
+    'Japan': 'East Asia and the Pacific',
+    'Korea (Republic of)': 'East Asia and the Pacific',
+    'United States': 'North America',
+    'Israel': 'Middle East and North Africa',
+    'Malta': 'Europe and Central Asia',
+    'Slovenia': 'Europe and Central Asia',
+    'Austria': 'Europe and Central Asia',
+    'United Arab Emirates': 'Middle East and North Africa',
+    'Spain': 'Europe and Central Asia',
+    'France': 'Europe and Central Asia',
+    'Cyprus': 'Europe and Central Asia',
+    'Italy': 'Europe and Central Asia',
+    'Estonia': 'Europe and Central Asia',
+    'Czechia': 'Europe and Central Asia',
+    'Greece': 'Europe and Central Asia',
+    'Poland': 'Europe and Central Asia',
+    'Bahrain': 'Middle East and North Africa',
+    'Lithuania': 'Europe and Central Asia',
+    'Saudi Arabia': 'Middle East and North Africa',
+    'Portugal': 'Europe and Central Asia',
+    'Latvia': 'Europe and Central Asia',
+    'Andorra': 'Europe and Central Asia',
+    'Croatia': 'Europe and Central Asia',
+    'Chile': 'Latin America and the Caribbean',
+    'Qatar': 'Middle East and North Africa',
+    'San Marino': 'Europe and Central Asia',
+    'Slovakia': 'Europe and Central Asia',
+    'Hungary': 'Europe and Central Asia',
+    'Argentina': 'Latin America and the Caribbean',
+    'Türkiye': 'Europe and Central Asia',
+    'Montenegro': 'Europe and Central Asia',
+    'Kuwait': 'Middle East and North Africa',
+    'Brunei Darussalam': 'East Asia and the Pacific',
+    'Russian Federation': 'Europe and Central Asia',
+    'Romania': 'Europe and Central Asia',
+    'Oman': 'Middle East and North Africa',
+    'Bahamas': 'Latin America and the Caribbean',
+    'Kazakhstan': 'Europe and Central Asia',
+    'Trinidad and Tobago': 'Latin America and the Caribbean',
+    'Costa Rica': 'Latin America and the Caribbean',
+    'Uruguay': 'Latin America and the Caribbean',
+    'Belarus': 'Europe and Central Asia',
+    'Panama': 'Latin America and the Caribbean',
+    'Malaysia': 'East Asia and the Pacific',
+    'Georgia': 'Europe and Central Asia',
+    'Mauritius': 'Sub-Saharan Africa',
+    'Serbia': 'Europe and Central Asia',
+    'Thailand': 'East Asia and the Pacific',
+    'Albania': 'Europe and Central Asia',
+    'Bulgaria': 'Europe and Central Asia',
+    'Grenada': 'Latin America and the Caribbean',
+    'Barbados': 'Latin America and the Caribbean',
+    'Antigua and Barbuda': 'Latin America and the Caribbean',
+    'Seychelles': 'Sub-Saharan Africa',
+    'Sri Lanka': 'South Asia',
+    'Bosnia and Herzegovina': 'Europe and Central Asia',
+    'Saint Kitts and Nevis': 'Latin America and the Caribbean',
+    'Iran (Islamic Republic of)': 'Middle East and North Africa',
+    'Ukraine': 'Europe and Central Asia',
+    'North Macedonia': 'Europe and Central Asia',
+    'China': 'East Asia and the Pacific',
+    'Dominican Republic': 'Latin America and the Caribbean',
+    'Moldova (Republic of)': 'Europe and Central Asia',
+    'Palau': 'East Asia and the Pacific',
+    'Cuba': 'Latin America and the Caribbean',
+    'Peru': 'Latin America and the Caribbean',
+    'Armenia': 'Europe and Central Asia',
+    'Mexico': 'Latin America and the Caribbean',
+    'Brazil': 'Latin America and the Caribbean',
+    'Colombia': 'Latin America and the Caribbean',
+    'Saint Vincent and the Grenadines': 'Latin America and the Caribbean',
+    'Maldives': 'South Asia',
+    'Algeria': 'Middle East and North Africa',
+    'Azerbaijan': 'Europe and Central Asia',
+    'Tonga': 'East Asia and the Pacific',
+    'Turkmenistan': 'Europe and Central Asia',
+    'Ecuador': 'Latin America and the Caribbean',
+    'Mongolia': 'East Asia and the Pacific',
+    'Egypt': 'Middle East and North Africa',
+    'Tunisia': 'Middle East and North Africa',
+    'Fiji': 'East Asia and the Pacific',
+    'Suriname': 'Latin America and the Caribbean',
+    'Uzbekistan': 'Europe and Central Asia',
+    'Dominica': 'Latin America and the Caribbean',
+    'Jordan': 'Middle East and North Africa',
+    'Libya': 'Middle East and North Africa',
+    'Paraguay': 'Latin America and the Caribbean',
+    'Palestine, State of': 'Middle East and North Africa',
+    'Saint Lucia': 'Latin America and the Caribbean',
+    'Guyana': 'Latin America and the Caribbean',
+    'South Africa': 'Sub-Saharan Africa',
+    'Jamaica': 'Latin America and the Caribbean',
+    'Samoa': 'East Asia and the Pacific',
+    'Gabon': 'Sub-Saharan Africa',
+    'Lebanon': 'Middle East and North Africa',
+    'Indonesia': 'East Asia and the Pacific',
+    'Viet Nam': 'East Asia and the Pacific',
+    'Philippines': 'East Asia and the Pacific',
+    'Botswana': 'Sub-Saharan Africa',
+    'Bolivia (Plurinational State of)': 'Latin America and the Caribbean',
+    'Kyrgyzstan': 'Europe and Central Asia',
+    'Venezuela (Bolivarian Republic of)': 'Latin America and the Caribbean',
+    'Iraq': 'Middle East and North Africa',
+    'Tajikistan': 'Europe and Central Asia',
+    'Belize': 'Latin America and the Caribbean',
+    'Morocco': 'Middle East and North Africa',
+    'El Salvador': 'Latin America and the Caribbean',
+    'Nicaragua': 'Latin America and the Caribbean',
+    'Bhutan': 'South Asia',
+    'Cabo Verde': 'Sub-Saharan Africa',
+    'Bangladesh': 'South Asia',
+    'Tuvalu': 'East Asia and the Pacific',
+    'Marshall Islands': 'East Asia and the Pacific',
+    'India': 'South Asia',
+    'Ghana': 'Sub-Saharan Africa',
+    'Micronesia (Federated States of)': 'East Asia and the Pacific',
+    'Guatemala': 'Latin America and the Caribbean',
+    'Kiribati': 'East Asia and the Pacific',
+    'Honduras': 'Latin America and the Caribbean',
+    'Sao Tome and Principe': 'Sub-Saharan Africa',
+    'Namibia': 'Sub-Saharan Africa',
+    "Lao People's Democratic Republic": 'East Asia and the Pacific',
+    'Timor-Leste': 'East Asia and the Pacific',
+    'Vanuatu': 'East Asia and the Pacific',
+    'Nepal': 'South Asia',
+    'Eswatini (Kingdom of)': 'Sub-Saharan Africa',
+    'Equatorial Guinea': 'Sub-Saharan Africa',
+    'Cambodia': 'East Asia and the Pacific',
+    'Zimbabwe': 'Sub-Saharan Africa',
+    'Angola': 'Sub-Saharan Africa',
+    'Myanmar': 'East Asia and the Pacific',
+    'Syrian Arab Republic': 'Middle East and North Africa',
+    'Cameroon': 'Sub-Saharan Africa',
+    'Kenya': 'Sub-Saharan Africa',
+    'Congo': 'Sub-Saharan Africa',
+    'Zambia': 'Sub-Saharan Africa',
+    'Solomon Islands': 'East Asia and the Pacific',
+    'Comoros': 'Sub-Saharan Africa',
+    'Papua New Guinea': 'East Asia and the Pacific',
+    'Mauritania': 'Sub-Saharan Africa',
+    "Côte d'Ivoire": 'Sub-Saharan Africa',
+    'Tanzania (United Republic of)': 'Sub-Saharan Africa',
+    'Pakistan': 'South Asia',
+    'Togo': 'Sub-Saharan Africa',
+    'Haiti': 'Latin America and the Caribbean',
+    'Nigeria': 'Sub-Saharan Africa',
+    'Rwanda': 'Sub-Saharan Africa',
+    'Benin': 'Sub-Saharan Africa',
+    'Uganda': 'Sub-Saharan Africa',
+    'Lesotho': 'Sub-Saharan Africa',
+    'Malawi': 'Sub-Saharan Africa',
+    'Senegal': 'Sub-Saharan Africa',
+    'Djibouti': 'Middle East and North Africa',
+    'Sudan': 'Sub-Saharan Africa',
+    'Madagascar': 'Sub-Saharan Africa',
+    'Gambia': 'Sub-Saharan Africa',
+    'Ethiopia': 'Sub-Saharan Africa',
+    'Eritrea': 'Sub-Saharan Africa',
+    'Guinea-Bissau': 'Sub-Saharan Africa',
+    'Liberia': 'Sub-Saharan Africa',
+    'Congo (Democratic Republic of the)': 'Sub-Saharan Africa',
+    'Afghanistan': 'South Asia',
+    'Sierra Leone': 'Sub-Saharan Africa',
+    'Guinea': 'Sub-Saharan Africa',
+    'Yemen': 'Middle East and North Africa',
+    'Burkina Faso': 'Sub-Saharan Africa',
+    'Mozambique': 'Sub-Saharan Africa',
+    'Mali': 'Sub-Saharan Africa',
+    'Burundi': 'Sub-Saharan Africa',
+    'Central African Republic': 'Sub-Saharan Africa',
+    'Niger': 'Sub-Saharan Africa',
+    'Chad': 'Sub-Saharan Africa',
+    'South Sudan': 'Sub-Saharan Africa',
+    'Somalia': 'Sub-Saharan Africa',
+    'Timor-Leste': 'East Asia and the Pacific',
+    'Unknown': 'Unknown'
+}
+
+# Nama di HDR21-22 time series yang berbeda dengan gender_inequality_index.xlsx
+country_aliases = {
+    'Turkey': 'Türkiye',
+}
+
+# Kode region UNDP di time series, dipakai bila negara tidak ada di country_to_region
+undp_region_names = {
+    'AS': 'Middle East and North Africa',
+    'EAP': 'East Asia and the Pacific',
+    'ECA': 'Europe and Central Asia',
+    'LAC': 'Latin America and the Caribbean',
+    'SA': 'South Asia',
+    'SSA': 'Sub-Saharan Africa',
+}
+
+
+def region_of(country, undp_region=None):
+    country = country_aliases.get(country, country)
+    if country in country_to_region:
+        return country_to_region[country]
+    return undp_region_names.get(undp_region, 'Unknown')
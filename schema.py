@@ -0,0 +1,39 @@
+import pandas as pd
+
+
+# Urutan kategori human development, sama dengan urutan label prediksi
+HD_CATEGORIES = pd.CategoricalDtype(['Low', 'Medium', 'High', 'Very High', 'Other'], ordered=True)
+
+# Skema ringkas untuk gender_inequality_index.xlsx: kategori untuk teks
+# berulang, integer kecil untuk ranking, float32 untuk indikator
+GII_SCHEMA = {
+    'HDI rank': 'int16',
+    'Country': 'category',
+    'Human Development': HD_CATEGORIES,
+    'GII Value': 'float32',
+    'GII Rank': 'Int16',  # nullable: 25 negara tanpa GII
+    'Maternal mortality ratio': 'float32',
+    'Adolescent birth rate': 'float32',
+    'Share of seats in parliament': 'float32',
+    'F_secondary_edu': 'float32',
+    'M_secondary_edu': 'float32',
+    'F_labour_force': 'float32',
+    'M_labour_force': 'float32',
+}
+
+
+def apply(df, schema=GII_SCHEMA):
+    missing = set(schema) - set(df.columns)
+    if missing:
+        raise ValueError(f'Kolom tidak ditemukan: {sorted(missing)}')
+    return df.astype(schema)
+
+
+def memory_report(before, after):
+    before_bytes = int(before.memory_usage(deep=True).sum())
+    after_bytes = int(after.memory_usage(deep=True).sum())
+    return {
+        'before_bytes': before_bytes,
+        'after_bytes': after_bytes,
+        'saved_pct': 100 * (1 - after_bytes / before_bytes) if before_bytes else 0.0,
+    }
@@ -0,0 +1,80 @@
+"""Cold-start report for a fresh dashboard process.
+
+    python startup_report.py [--top 15]
+
+Runs capstone.py once in a new interpreter with ``-X importtime`` (Streamlit
+bare mode, no server) and reports the total wall time, the total import
+time and the slowest top-level imports. The report is saved to
+.cache/perf/startup.json and compared with the previous one.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import data_cache
+
+
+REPORT_PATH = os.path.join(data_cache.CACHE_DIR, 'perf', 'startup.json')
+
+
+def parse_importtime(stderr):
+    """Top-level modules -> cumulative import time in seconds."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Modul yang di-import langsung oleh script tidak diindentasi
+        if not name.startswith('  '):
+            imports[name.strip()] = int(cumulative) / 1e6
+    return imports
+
+
+def measure(script='capstone.py'):
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', script],
+                            capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'{script} gagal dijalankan:\n{result.stderr[-2000:]}')
+    imports = parse_importtime(result.stderr)
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'wall_s': wall,
+        'import_s': sum(imports.values()),
+        'imports': imports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    previous = None
+    if os.path.exists(REPORT_PATH):
+        with open(REPORT_PATH) as f:
+            previous = json.load(f)
+
+    report = measure()
+    print(f"cold start: {report['wall_s']:.2f}s wall, {report['import_s']:.2f}s in imports")
+    if previous:
+        print(f"previous:   {previous['wall_s']:.2f}s wall, {previous['import_s']:.2f}s in imports")
+
+    print(f"\n{'module':40} {'ms':>9} {'prev ms':>9}")
+    slowest = sorted(report['imports'].items(), key=lambda item: -item[1])[:args.top]
+    for name, seconds in slowest:
+        prev = previous['imports'].get(name) if previous else None
+        prev = f'{1000 * prev:9.1f}' if prev is not None else f"{'-':>9}"
+        print(f'{name:40} {1000 * seconds:9.1f} {prev}')
+
+    with data_cache.atomic_write(REPORT_PATH, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
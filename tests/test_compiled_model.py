@@ -0,0 +1,66 @@
+"""The compiled evaluator must agree with xgboost on every country-year.
+
+Runs on the real model artifact and HDR time series (GII_MODEL_PATH,
+GII_TIME_SERIES_PATH) and is skipped when either file or xgboost is missing.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import data_cache
+import model_registry
+
+pytest.importorskip('xgboost')
+pytestmark = pytest.mark.skipif(
+    not (os.path.exists(model_registry.MODEL_PATH) and os.path.exists(data_cache.TIME_SERIES_PATH)),
+    reason='model artifact or time series not available')
+
+PROBA_TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope='module')
+def features():
+    import timeseries
+    from batch_predict import build_features
+
+    return build_features(timeseries.open_store(data_cache.TIME_SERIES_PATH))[model_registry.FEATURE_COLUMNS]
+
+
+@pytest.fixture(scope='module')
+def model():
+    return model_registry.get_model().model
+
+
+@pytest.fixture(scope='module')
+def compiled():
+    import compiled_model
+
+    return compiled_model.open_compiled()
+
+
+def test_classes_match_xgboost(features, model, compiled):
+    np.testing.assert_array_equal(compiled.predict(features), model.predict(features))
+
+
+def test_probabilities_match_xgboost(features, model, compiled):
+    np.testing.assert_allclose(compiled.predict_proba(features), model.predict_proba(features),
+                               rtol=0, atol=PROBA_TOLERANCE)
+
+
+def test_missing_features_follow_default_branch(features, model, compiled):
+    missing = features[features.isna().any(axis=1)]
+    assert len(missing), 'time series tanpa baris NaN tidak menguji default branch'
+    np.testing.assert_array_equal(compiled.predict(missing), model.predict(missing))
+    np.testing.assert_allclose(compiled.predict_proba(missing), model.predict_proba(missing),
+                               rtol=0, atol=PROBA_TOLERANCE)
+
+
+def test_single_row_fallback_matches_xgboost(features, model):
+    import inference_service
+
+    # Jalur in-process dashboard: satu baris per panggilan
+    missing = features.isna().any(axis=1).to_numpy()
+    rows = np.r_[np.flatnonzero(missing)[:25], np.flatnonzero(~missing)[:25]]
+    predicted = [int(inference_service.predict(features.iloc[[i]])[0]) for i in rows]
+    assert predicted == model.predict(features.iloc[rows]).tolist()
@@ -0,0 +1,178 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+
+
+# Satu baris per (iso3, indicator, sex, year); key disimpan sebagai kode kategori
+RECORD_DTYPE = np.dtype([
+    ('iso3', 'i2'),
+    ('indicator', 'i2'),
+    ('sex', 'i1'),
+    ('year', 'i2'),
+    ('value', 'f4'),
+])
+SEXES = ['total', 'f', 'm']
+KEY_COLUMNS = ['iso3', 'country', 'hdicode', 'region']
+
+_column_pattern = re.compile(r'^(?P<name>.+)_(?P<year>(19|20)\d\d)$')
+_sex_pattern = re.compile(r'^(?P<name>.+)_(?P<sex>[fm])$')
+
+_stores = data_cache.VersionedCache('open_store')
+
+
+def split_indicator(column):
+    """'lfpr_f' -> ('lfpr', 'f'), 'gii' -> ('gii', 'total')."""
+    match = _sex_pattern.match(column)
+    if match:
+        return match.group('name'), match.group('sex')
+    return column, 'total'
+
+
+def _store_paths(version):
+    base = os.path.join(data_cache.CACHE_DIR, f'timeseries-{version[:16]}')
+    return base + '.npy', base + '.json'
+
+
+def build_store(path):
+    """Reshape the wide HDR21-22 table into the long store and write it."""
+    version = data_cache.source_version(path)
+    wide = data_cache.load_time_series(path)
+
+    value_columns = []
+    for column in wide.columns:
+        match = _column_pattern.match(column)
+        if match:
+            indicator, sex = split_indicator(match.group('name'))
+            value_columns.append((column, indicator, sex, int(match.group('year'))))
+
+    indicators = sorted({indicator for _, indicator, _, _ in value_columns})
+    indicator_codes = {name: i for i, name in enumerate(indicators)}
+    sex_codes = {name: i for i, name in enumerate(SEXES)}
+
+    values = wide[[c for c, _, _, _ in value_columns]].to_numpy(dtype='float32')
+    n_rows, n_columns = values.shape
+    records = np.empty(n_rows * n_columns, dtype=RECORD_DTYPE)
+    records['iso3'] = np.repeat(np.arange(n_rows, dtype='i2'), n_columns)
+    records['indicator'] = np.tile([indicator_codes[i] for _, i, _, _ in value_columns], n_rows)
+    records['sex'] = np.tile([sex_codes[s] for _, _, s, _ in value_columns], n_rows)
+    records['year'] = np.tile([y for _, _, _, y in value_columns], n_rows)
+    records['value'] = values.ravel()
+
+    # Buang sel kosong, lalu urutkan agar tiap (indicator, sex) dan rentang tahun berurutan
+    records = records[~np.isnan(records['value'])]
+    records = records[np.lexsort((records['iso3'], records['year'],
+                                  records['sex'], records['indicator']))]
+
+    block_keys = records['indicator'].astype('i4') * len(SEXES) + records['sex']
+    starts = np.flatnonzero(np.r_[True, block_keys[1:] != block_keys[:-1]])
+    stops = np.r_[starts[1:], len(records)]
+    blocks = {}
+    for start, stop in zip(starts, stops):
+        key = f"{indicators[records['indicator'][start]]}|{SEXES[records['sex'][start]]}"
+        blocks[key] = [int(start), int(stop)]
+
+    meta = {
+        'version': version,
+        'indicators': indicators,
+        'years': sorted({y for _, _, _, y in value_columns}),
+        'countries': wide[KEY_COLUMNS].where(wide[KEY_COLUMNS].notna(), None).to_dict('list'),
+        'blocks': blocks,
+    }
+
+    npy_path, meta_path = _store_paths(version)
+    with data_cache.atomic_write(npy_path) as f:
+        np.save(f, records)
+    with data_cache.atomic_write(meta_path, 'w') as f:
+        json.dump(meta, f)
+    return npy_path, meta_path
+
+
+class TimeSeriesStore:
+    """Read-only view over the memory-mapped long store."""
+
+    def __init__(self, npy_path, meta_path):
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        self.records = np.load(npy_path, mmap_mode='r')
+        self.version = self.meta['version']
+        self.indicators = self.meta['indicators']
+        self.years = np.array(self.meta['years'], dtype='i2')
+        self.countries = pd.DataFrame(self.meta['countries'])
+        # Baris agregat (ZZA.VHHD, ZZK.WORLD, ...) bukan negara
+        self.is_country = ~self.countries['iso3'].str.startswith('ZZ').to_numpy()
+
+    def _block(self, indicator, sex=None, years=None):
+        if sex is None:
+            indicator, sex = split_indicator(indicator)
+        start, stop = self.meta['blocks'].get(f'{indicator}|{sex}', (0, 0))
+        block = self.records[start:stop]
+        if years is not None and len(block):
+            first, last = years
+            lo = np.searchsorted(block['year'], first, side='left')
+            hi = np.searchsorted(block['year'], last, side='right')
+            block = block[lo:hi]
+        return block
+
+    def load(self, indicator, sex=None, years=None, countries_only=True):
+        """Long frame for one indicator, e.g. ``load('lfpr_f', years=(2000, 2021))``."""
+        block = np.asarray(self._block(indicator, sex, years))
+        if countries_only:
+            block = block[self.is_country[block['iso3']]]
+        return pd.DataFrame({
+            'iso3': pd.Categorical.from_codes(block['iso3'], self.countries['iso3']),
+            'indicator': pd.Categorical.from_codes(block['indicator'], self.indicators),
+            'sex': pd.Categorical.from_codes(block['sex'], SEXES),
+            'year': block['year'],
+            'value': block['value'],
+        })
+
+    def matrix(self, indicator, sex=None, years=None, countries_only=True):
+        """(country, year) float32 array with NaN gaps, plus its year axis."""
+        block = self._block(indicator, sex, years)
+        axis = self.years
+        if years is not None:
+            axis = axis[(axis >= years[0]) & (axis <= years[1])]
+        out = np.full((len(self.countries), len(axis)), np.nan, dtype='float32')
+        out[block['iso3'], block['year'] - axis[0]] = block['value']
+        if countries_only:
+            out = out[self.is_country]
+        return out, axis
+
+    def country_table(self, countries_only=True):
+        if countries_only:
+            return self.countries[self.is_country].reset_index(drop=True)
+        return self.countries
+
+
+def open_store(path):
+    """Open (building on first use) the store for the current source version.
+
+    Instances are shared per process, so every session reads the same
+    memory-mapped pages.
+    """
+    version = data_cache.source_version(path)
+
+    def open_or_build():
+        npy_path, meta_path = _store_paths(version)
+        if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+            npy_path, meta_path = build_store(path)
+        return TimeSeriesStore(npy_path, meta_path)
+
+    return _stores.get(version, open_or_build)
+
+
+# Batas kelompok human development UNDP (HDR Technical Notes)
+HD_THRESHOLDS = [0.550, 0.700, 0.800]
+
+
+def hd_group_codes(hdi):
+    """HDI values -> 0 Low, 1 Medium, 2 High, 3 Very High (NaN stays NaN)."""
+    hdi = np.asarray(hdi, dtype='float32')
+    codes = np.digitize(hdi, HD_THRESHOLDS).astype('float32')
+    codes[np.isnan(hdi)] = np.nan
+    return codes
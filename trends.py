@@ -0,0 +1,98 @@
+"""Per-country female/male trends from the time-series store.
+
+Traces are cut from the (country, year) matrices and, when many countries
+are overlaid, downsampled with Largest-Triangle-Three-Buckets so the figure
+stays within ``MAX_POINTS``. Each downsampled trace is cached per
+(data version, indicator, country, threshold).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import data_cache
+
+# Judul chart -> (indikator perempuan, indikator laki-laki)
+PAIRS = {
+    'Labor Force Participation': ('lfpr_f', 'lfpr_m'),
+    'Secondary Education Participation': ('se_f', 'se_m'),
+    'Share of Seats in Parliament': ('pr_f', 'pr_m'),
+}
+DEFAULT_COUNTRIES = ['Indonesia', 'Yemen', 'Qatar', 'Sweden']
+MAX_POINTS = 2000
+MIN_POINTS = 8
+CACHE_SIZE = 4096
+
+_traces = OrderedDict()
+# Satu matriks per indikator dari PAIRS untuk versi data yang sedang dipakai
+_matrices = data_cache.VersionedCache('trend_matrix', keep=2 * len(PAIRS))
+_lock = threading.Lock()
+
+
+def lttb(x, y, threshold):
+    """Indices of the ``threshold`` points LTTB keeps from ``(x, y)``."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    keep = np.empty(threshold, dtype='i8')
+    keep[0], keep[-1] = 0, n - 1
+    # Titik tengah dibagi rata ke threshold - 2 bucket
+    edges = np.linspace(1, n - 1, threshold - 1).astype('i8')
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        # Luas segitiga (a, kandidat, rata-rata bucket berikutnya)
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def _matrix(store, indicator):
+    return _matrices.get((store.version, indicator), lambda: store.matrix(indicator)[0])
+
+
+def points_per_trace(n_traces):
+    return max(MIN_POINTS, MAX_POINTS // max(n_traces, 1))
+
+
+def trace(store, indicator, row, threshold):
+    """``(years, values)`` for country ``row`` without gaps, downsampled."""
+    key = (store.version, indicator, row, threshold)
+    with _lock:
+        if key in _traces:
+            _traces.move_to_end(key)
+            return _traces[key]
+
+    values = _matrix(store, indicator)[row].astype('float64')
+    observed = ~np.isnan(values)
+    x = store.years[observed].astype('float64')
+    y = values[observed]
+    keep = lttb(x, y, threshold)
+    result = (x[keep].astype('i2'), y[keep])
+    with _lock:
+        _traces[key] = result
+        while len(_traces) > CACHE_SIZE:
+            _traces.popitem(last=False)
+    return result
+
+
+def country_traces(store, pair, countries):
+    """One female and one male trace per selected country name."""
+    names = store.country_table()['country'].tolist()
+    rows = [names.index(country) for country in countries if country in names]
+    threshold = points_per_trace(2 * len(rows))
+    female, male = PAIRS[pair]
+    traces = []
+    for row in rows:
+        for sex, indicator in (('Female', female), ('Male', male)):
+            years, values = trace(store, indicator, row, threshold)
+            traces.append({'country': names[row], 'sex': sex, 'years': years, 'values': values})
+    return traces